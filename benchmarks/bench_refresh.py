@@ -0,0 +1,181 @@
+"""Measure the refresh path against a local mock xo-server.
+
+For every scale the mock server is started in-process and the benchmark
+reports wall time, HTTP requests and bytes, and peak Python memory for:
+
+- the API client: cold and warm inventory, power states, host stats;
+- the integration: setup, including the first refresh, and a later refresh;
+- each entity platform: the time to build its entities.
+
+The coordinator and platform phases need Home Assistant installed
+(``pip install -r requirements.txt``); without it only the API client is
+measured. No network access is needed.
+
+    python benchmarks/bench_refresh.py --scales 50 500 5000 --latency 0.01
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Awaitable, Callable, List
+
+from harness import (
+    HAS_HOMEASSISTANT,
+    add_config_entry,
+    create_hass,
+    import_integration,
+    serve_mock,
+)
+from mock_xo_server import MockOptions, MockXoServer
+
+PLATFORMS = ("sensor", "switch", "binary_sensor", "button")
+
+XenOrchestraAPI = import_integration("api").XenOrchestraAPI
+const = import_integration("const")
+
+
+class Measurement:
+    """Wall time, requests and peak memory of one benchmark phase."""
+
+    def __init__(self, server: MockXoServer, name: str) -> None:
+        """Initialize the measurement."""
+        self._server = server
+        self.name = name
+        self.seconds = 0.0
+        self.requests = 0
+        self.bytes = 0
+        self.peak_memory = 0
+        self.detail = ""
+
+    async def run(self, phase: Callable[[], Awaitable[Any]]) -> Any:
+        """Run a phase and record what it cost."""
+        self._server.stats.reset()
+        tracemalloc.start()
+        start = time.perf_counter()
+        try:
+            return await phase()
+        finally:
+            self.seconds = time.perf_counter() - start
+            _, self.peak_memory = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            self.requests = self._server.stats.total_requests
+            self.bytes = self._server.stats.bytes_sent
+
+    def row(self) -> str:
+        """Format the measurement as a report line."""
+        return (
+            f"  {self.name:<28} {self.seconds * 1000:>10.1f} ms {self.requests:>7} req "
+            f"{self.bytes / 1024:>10.1f} KiB {self.peak_memory / 2**20:>8.2f} MiB"
+            f"  {self.detail}"
+        )
+
+
+async def bench_api(server: MockXoServer, url: str) -> List[Measurement]:
+    """Measure the API client calls a refresh is made of."""
+    api = XenOrchestraAPI(url, "benchmark-token", ssl_verify=False)
+    results = []
+    try:
+        for name, call in (
+            ("api cold inventory", _inventory),
+            ("api warm inventory", _inventory),
+            ("api power states", lambda api: api.getVMPowerStates()),
+            ("api host stats", _host_stats),
+        ):
+            measurement = Measurement(server, name)
+            result = await measurement.run(lambda: call(api))
+            if isinstance(result, (list, dict, tuple)):
+                measurement.detail = f"{len(result)} objects"
+            results.append(measurement)
+    finally:
+        await api.close()
+    return results
+
+
+async def _inventory(api: XenOrchestraAPI) -> tuple:
+    """Fetch VMs, hosts and pools like an inventory refresh does."""
+    vms, hosts, pools = await asyncio.gather(api.getVMs(), api.getHosts(), api.getPools())
+    return (*vms, *hosts, *pools)
+
+
+async def _host_stats(api: XenOrchestraAPI) -> list:
+    """Fetch the stats of every host."""
+    hosts = await api.getHosts()
+    return await asyncio.gather(*(api.getHostStats(host.uuid) for host in hosts))
+
+
+async def bench_coordinator(server: MockXoServer, url: str) -> List[Measurement]:
+    """Measure the integration setup, a refresh and platform entity setup."""
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = await create_hass(config_dir)
+        results = []
+        try:
+            measurement = Measurement(server, "integration setup")
+            entry = await measurement.run(lambda: add_config_entry(hass, url))
+            results.append(measurement)
+            coordinator = hass.data[const.DOMAIN][entry.entry_id]["coordinator"]
+
+            # Only due tiers are fetched; make the power states and stats due
+            # like a steady-state update where their intervals elapsed
+            coordinator._power_due = coordinator._stats_due = 0.0
+            measurement = Measurement(server, "coordinator next refresh")
+            await measurement.run(coordinator.async_refresh)
+            measurement.detail = "ok" if coordinator.last_update_success else "failed"
+            results.append(measurement)
+
+            for platform in PLATFORMS:
+                module = import_integration(platform)
+                entities: list = []
+                measurement = Measurement(server, f"setup {platform}")
+                await measurement.run(
+                    lambda: module.async_setup_entry(hass, entry, entities.extend)
+                )
+                measurement.detail = f"{len(entities)} entities"
+                results.append(measurement)
+        finally:
+            await hass.async_stop(force=True)
+    return results
+
+
+async def bench_scale(vms: int, args: argparse.Namespace) -> List[Measurement]:
+    """Run every benchmark against a server with the given number of VMs."""
+    options = MockOptions(
+        vms=vms,
+        hosts=max(1, vms // args.vms_per_host),
+        pools=args.pools,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        projection=not args.no_projection,
+    )
+    async with serve_mock(options) as (server, url):
+        results = await bench_api(server, url)
+        if HAS_HOMEASSISTANT:
+            results += await bench_coordinator(server, url)
+        return results
+
+
+async def main() -> None:
+    """Run the benchmarks and print a report per scale."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scales", type=int, nargs="+", default=[50, 500, 5000])
+    parser.add_argument("--vms-per-host", type=int, default=25)
+    parser.add_argument("--pools", type=int, default=1)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--no-projection", action="store_true")
+    args = parser.parse_args()
+
+    if not HAS_HOMEASSISTANT:
+        print("Home Assistant is not installed, measuring the API client only")
+    for vms in args.scales:
+        print(f"\n{vms} VMs")
+        for measurement in await bench_scale(vms, args):
+            print(measurement.row())
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,126 @@
+"""Helpers shared by the benchmarks and the tests.
+
+They load the integration, with or without Home Assistant installed, serve
+the mock xo-server in-process and build a bare Home Assistant instance.
+"""
+from __future__ import annotations
+
+import contextlib
+import importlib
+import importlib.util
+import inspect
+import sys
+import types
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, AsyncIterator, Dict
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+BENCHMARKS_DIR = Path(__file__).resolve().parent
+INTEGRATION_DIR = REPO_DIR / "custom_components" / "xen_orchestra"
+PACKAGE = "custom_components.xen_orchestra"
+
+for path in (BENCHMARKS_DIR, REPO_DIR):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+HAS_HOMEASSISTANT = importlib.util.find_spec("homeassistant") is not None
+
+
+def install_integration_package() -> None:
+    """Make the integration modules importable.
+
+    The package __init__ imports Home Assistant; without it the directory
+    is exposed as a bare package so the API client modules, which do not,
+    can still be imported.
+    """
+    if HAS_HOMEASSISTANT or PACKAGE in sys.modules:
+        return
+    package = types.ModuleType(PACKAGE)
+    package.__path__ = [str(INTEGRATION_DIR)]
+    sys.modules[PACKAGE] = package
+
+
+def import_integration(name: str) -> types.ModuleType:
+    """Import a module of the integration, without Home Assistant if need be."""
+    install_integration_package()
+    return importlib.import_module(f"{PACKAGE}.{name}")
+
+
+@contextlib.asynccontextmanager
+async def serve_mock(options: Any) -> AsyncIterator[tuple[Any, str]]:
+    """Serve a mock xo-server on a free local port, yielding it and its URL."""
+    from aiohttp import web
+
+    from mock_xo_server import MockXoServer
+
+    server = MockXoServer(options)
+    runner = web.AppRunner(server.create_app())
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    host, port = runner.addresses[0][:2]
+    try:
+        yield server, f"http://{host}:{port}"
+    finally:
+        await runner.cleanup()
+
+
+async def create_hass(config_dir: str) -> Any:
+    """Create a bare Home Assistant instance able to set up the integration."""
+    from homeassistant import bootstrap, loader
+    from homeassistant.config_entries import ConfigEntries
+    from homeassistant.core import HomeAssistant
+
+    if "config_dir" in inspect.signature(HomeAssistant).parameters:
+        hass = HomeAssistant(config_dir)
+    else:
+        hass = HomeAssistant()
+        hass.config.config_dir = config_dir
+    # The requirements are installed, never run pip
+    hass.config.skip_pip = True
+    if hasattr(loader, "async_setup"):
+        loader.async_setup(hass)
+    hass.config_entries = ConfigEntries(hass, {})
+    if hasattr(bootstrap, "async_load_base_functionality"):
+        # Registries, translations and the config entries
+        await bootstrap.async_load_base_functionality(hass)
+    else:
+        from homeassistant.helpers import device_registry as dr
+        from homeassistant.helpers import entity_registry as er
+
+        await hass.config_entries.async_initialize()
+        await dr.async_load(hass)
+        await er.async_load(hass)
+    return hass
+
+
+async def add_config_entry(hass: Any, url: str, options: Dict[str, Any] | None = None) -> Any:
+    """Add a config entry for the mock server and set the integration up."""
+    from homeassistant.config_entries import ConfigEntry, ConfigEntryState
+
+    const = import_integration("const")
+    candidates: Dict[str, Any] = {
+        "version": 1,
+        "minor_version": 1,
+        "domain": const.DOMAIN,
+        "title": "Mock Xen Orchestra",
+        "data": {
+            const.CONF_API_URL: url,
+            const.CONF_API_TOKEN: "mock-token",
+            const.CONF_SSL_VERIFY: False,
+        },
+        "options": {const.CONF_PUSH_UPDATES: False, **(options or {})},
+        "source": "user",
+        "unique_id": None,
+        "discovery_keys": MappingProxyType({}),
+        "subentries_data": None,
+    }
+    # The constructor arguments differ between Home Assistant releases
+    parameters = inspect.signature(ConfigEntry).parameters
+    entry = ConfigEntry(**{key: value for key, value in candidates.items() if key in parameters})
+    await hass.config_entries.async_add(entry)
+    await hass.async_block_till_done()
+    if entry.state is not ConfigEntryState.LOADED:
+        raise RuntimeError(f"Setting up the integration failed: {entry.state}")
+    return entry
@@ -0,0 +1,317 @@
+"""Stand-in for the xo-server REST API used by the benchmarks.
+
+Serves generated pools, hosts and VMs under /rest/v0 with the behaviour the
+integration relies on: field projection, per-object detail paths, stats,
+202 actions with tasks and ETag revalidation. Latency and error rates can
+be injected, and every request is counted per endpoint class.
+
+Run it standalone to point a development Home Assistant at it:
+
+    python benchmarks/mock_xo_server.py --vms 500 --hosts 8 --port 8080
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import hashlib
+import json
+import random
+import uuid
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Dict, List
+
+from aiohttp import web
+
+ROOT = "/rest/v0"
+
+
+@dataclass
+class MockOptions:
+    """Size and behaviour of the generated Xen Orchestra."""
+
+    vms: int = 50
+    hosts: int = 4
+    pools: int = 1
+    # Seconds added to every response, plus up to jitter seconds at random
+    latency: float = 0.0
+    jitter: float = 0.0
+    # Share of requests answered with a 503
+    error_rate: float = 0.0
+    # Number of first requests answered with a 503
+    failing_requests: int = 0
+    # When False, ?fields= is ignored like on older xo-server versions
+    projection: bool = True
+    # When set, listings with ?fields= are answered with this status
+    projection_status: int = 0
+    # Seconds a VM action task stays pending
+    task_duration: float = 1.0
+    seed: int = 0
+
+
+@dataclass
+class MockStats:
+    """What the server has been asked for."""
+
+    requests: Counter = field(default_factory=Counter)
+    bytes_sent: int = 0
+    errors: int = 0
+    not_modified: int = 0
+
+    @property
+    def total_requests(self) -> int:
+        """Return the number of requests served."""
+        return sum(self.requests.values())
+
+    def reset(self) -> None:
+        """Forget the requests counted so far."""
+        self.requests.clear()
+        self.bytes_sent = 0
+        self.errors = 0
+        self.not_modified = 0
+
+
+class MockXoServer:
+    """Generated pools, hosts and VMs served like xo-server's REST API."""
+
+    def __init__(self, options: MockOptions) -> None:
+        """Generate the objects."""
+        self.options = options
+        self.stats = MockStats()
+        self._random = random.Random(options.seed)
+        self._tasks: Dict[str, Dict[str, Any]] = {}
+        self.objects: Dict[str, Dict[str, Dict[str, Any]]] = {
+            "pools": {},
+            "hosts": {},
+            "vms": {},
+        }
+        self._generate()
+
+    def _uuid(self) -> str:
+        """Return a reproducible UUID."""
+        return str(uuid.UUID(int=self._random.getrandbits(128), version=4))
+
+    def _generate(self) -> None:
+        """Build the pools, hosts and VMs."""
+        options = self.options
+        pools = [self._uuid() for _ in range(max(1, options.pools))]
+        hosts = []
+        for index in range(options.hosts):
+            pool = pools[index % len(pools)]
+            host_id = self._uuid()
+            hosts.append(host_id)
+            self.objects["hosts"][host_id] = {
+                "type": "host",
+                "uuid": host_id,
+                "name_label": f"host-{index:03d}",
+                "power_state": "Running",
+                "enabled": True,
+                "$pool": pool,
+                "cpus": {"cores": 32, "sockets": 2},
+                "memory": {"size": 256 * 2**30, "usage": 128 * 2**30},
+            }
+        for index, pool_id in enumerate(pools):
+            self.objects["pools"][pool_id] = {
+                "type": "pool",
+                "uuid": pool_id,
+                "name_label": f"pool-{index:02d}",
+                "master": next(
+                    (h for h in hosts if self.objects["hosts"][h]["$pool"] == pool_id),
+                    None,
+                ),
+            }
+        for index in range(options.vms):
+            vm_id = self._uuid()
+            host_id = hosts[index % len(hosts)] if hosts else None
+            running = self._random.random() < 0.8
+            self.objects["vms"][vm_id] = {
+                "type": "VM",
+                "uuid": vm_id,
+                "name_label": f"vm-{index:05d}",
+                "power_state": "Running" if running else "Halted",
+                "tags": ["lab"] if index % 3 == 0 else [],
+                "$container": host_id if running else None,
+                "$pool": self.objects["hosts"][host_id]["$pool"] if host_id else pools[0],
+                # Unprojected objects are much larger than what the
+                # integration reads, like the real ones
+                "CPUs": {"max": 4, "number": 2},
+                "memory": {"dynamic": [2**30, 4 * 2**30], "size": 4 * 2**30},
+                "os_version": {"distro": "debian", "major": "12"},
+                "addresses": {"0/ipv4/0": f"10.0.{index // 250}.{index % 250}"},
+                "VIFs": [f"vif-{index}-0"],
+                "$VBDs": [f"vbd-{index}-0", f"vbd-{index}-1"],
+                "other": {"description": "x" * 512},
+            }
+
+    def create_app(self) -> web.Application:
+        """Return the aiohttp application serving the API."""
+        app = web.Application(middlewares=[self._middleware])
+        app.router.add_get(ROOT + "/tasks/{task_id}", self._get_task)
+        app.router.add_get(ROOT + "/{kind}", self._get_collection)
+        app.router.add_get(ROOT + "/{kind}/{object_id}", self._get_object)
+        app.router.add_get(ROOT + "/{kind}/{object_id}/stats", self._get_stats)
+        app.router.add_post(
+            ROOT + "/vms/{object_id}/actions/{action}", self._post_action
+        )
+        return app
+
+    @web.middleware
+    async def _middleware(self, request: web.Request, handler: Any) -> web.StreamResponse:
+        """Count requests and inject latency and errors."""
+        self.stats.requests[_endpoint_class(request)] += 1
+        delay = self.options.latency + self._random.random() * self.options.jitter
+        if delay:
+            await asyncio.sleep(delay)
+        if (
+            self.stats.total_requests <= self.options.failing_requests
+            or self._random.random() < self.options.error_rate
+        ):
+            self.stats.errors += 1
+            return web.Response(status=503, text="injected error")
+        response = await handler(request)
+        if isinstance(response, web.Response) and response.body is not None:
+            self.stats.bytes_sent += len(response.body)
+        return response
+
+    def _json(self, request: web.Request, body: Any, status: int = 200) -> web.Response:
+        """Serialize a body, answering 304 when the client's ETag matches."""
+        payload = json.dumps(body).encode()
+        etag = '"' + hashlib.sha1(payload).hexdigest() + '"'
+        if status == 200 and request.headers.get("If-None-Match") == etag:
+            self.stats.not_modified += 1
+            return web.Response(status=304, headers={"ETag": etag})
+        return web.Response(
+            body=payload,
+            status=status,
+            content_type="application/json",
+            headers={"ETag": etag},
+        )
+
+    async def _get_collection(self, request: web.Request) -> web.Response:
+        """List a collection, projected when ?fields= is honoured."""
+        objects = self._collection(request)
+        fields = request.query.get("fields")
+        if fields and self.options.projection_status:
+            return web.Response(status=self.options.projection_status, text="fields refused")
+        if fields and self.options.projection:
+            keys = fields.split(",")
+            body: List[Any] = [
+                {key: obj[key] for key in keys if key in obj} for obj in objects.values()
+            ]
+        else:
+            body = [f"{ROOT}/{request.match_info['kind']}/{uuid}" for uuid in objects]
+        return self._json(request, body)
+
+    async def _get_object(self, request: web.Request) -> web.Response:
+        """Return a single object."""
+        obj = self._collection(request).get(request.match_info["object_id"])
+        if obj is None:
+            raise web.HTTPNotFound()
+        return self._json(request, obj)
+
+    async def _get_stats(self, request: web.Request) -> web.Response:
+        """Return RRD stats shaped like xo-server's, a minute of samples."""
+        obj = self._collection(request).get(request.match_info["object_id"])
+        if obj is None:
+            raise web.HTTPNotFound()
+        samples = 60
+
+        def series(scale: float) -> List[float]:
+            return [round(self._random.random() * scale, 3) for _ in range(samples)]
+
+        stats: Dict[str, Any] = {
+            "cpus": {str(core): series(100) for core in range(8)},
+            "memory": [16 * 2**30] * samples,
+            "memoryFree": series(8 * 2**30),
+        }
+        if request.match_info["kind"] == "vms":
+            stats["xvds"] = {"r": {"xvda": series(2**20)}, "w": {"xvda": series(2**20)}}
+            stats["iops"] = {"r": {"xvda": series(100)}, "w": {"xvda": series(100)}}
+            stats["vifs"] = {"rx": {"0": series(2**20)}, "tx": {"0": series(2**20)}}
+        else:
+            stats["pifs"] = {"rx": {"0": series(2**24)}, "tx": {"0": series(2**24)}}
+        return self._json(request, {"endTimestamp": 0, "interval": 5, "stats": stats})
+
+    async def _post_action(self, request: web.Request) -> web.Response:
+        """Start a task changing the VM's power state after a delay."""
+        vm = self.objects["vms"].get(request.match_info["object_id"])
+        if vm is None:
+            raise web.HTTPNotFound()
+        task_id = self._uuid()
+        self._tasks[task_id] = {"id": task_id, "status": "pending", "properties": {}}
+        asyncio.get_running_loop().call_later(
+            self.options.task_duration,
+            self._finish_task,
+            task_id,
+            vm,
+            request.match_info["action"],
+        )
+        return web.Response(status=202, text=f"{ROOT}/tasks/{task_id}")
+
+    def _finish_task(self, task_id: str, vm: Dict[str, Any], action: str) -> None:
+        """Apply an action and mark its task as done."""
+        if action in ("start", "clean_reboot", "hard_reboot", "resume", "unpause"):
+            vm["power_state"] = "Running"
+        elif action in ("clean_shutdown", "hard_shutdown"):
+            vm["power_state"] = "Halted"
+        elif action == "pause":
+            vm["power_state"] = "Paused"
+        elif action == "suspend":
+            vm["power_state"] = "Suspended"
+        self._tasks[task_id]["status"] = "success"
+
+    async def _get_task(self, request: web.Request) -> web.Response:
+        """Return the state of a task."""
+        task = self._tasks.get(request.match_info["task_id"])
+        if task is None:
+            raise web.HTTPNotFound()
+        return self._json(request, task)
+
+    def _collection(self, request: web.Request) -> Dict[str, Dict[str, Any]]:
+        """Return the objects of the collection named in the path."""
+        objects = self.objects.get(request.match_info["kind"])
+        if objects is None:
+            raise web.HTTPNotFound()
+        return objects
+
+
+def _endpoint_class(request: web.Request) -> str:
+    """Group a request path by shape, e.g. "GET vms/{id}/stats"."""
+    parts = request.path[len(ROOT) + 1:].split("/") if request.path.startswith(ROOT) else []
+    if not parts or not parts[0]:
+        return f"{request.method} other"
+    shape = [parts[0]] + ["{id}" if index == 0 else part for index, part in enumerate(parts[1:])]
+    if len(parts) >= 4 and parts[2] == "actions":
+        shape[-1] = "{action}"
+    return f"{request.method} {'/'.join(shape)}"
+
+
+def main() -> None:
+    """Serve a generated Xen Orchestra until interrupted."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--vms", type=int, default=50)
+    parser.add_argument("--hosts", type=int, default=4)
+    parser.add_argument("--pools", type=int, default=1)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--no-projection", action="store_true")
+    parser.add_argument("--port", type=int, default=8080)
+    args = parser.parse_args()
+
+    server = MockXoServer(
+        MockOptions(
+            vms=args.vms,
+            hosts=args.hosts,
+            pools=args.pools,
+            latency=args.latency,
+            jitter=args.jitter,
+            error_rate=args.error_rate,
+            projection=not args.no_projection,
+        )
+    )
+    web.run_app(server.create_app(), port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,23 +3,77 @@
 """The Xen Orchestra integration."""
 from __future__ import annotations
 
+import asyncio
+import contextlib
+import dataclasses
 import logging
+import time
 from datetime import timedelta
+from typing import Any, Awaitable, Callable, Iterable, TypeVar
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers import device_registry as dr
-from homeassistant.helpers.device_registry import DeviceEntryType, DeviceInfo
+from homeassistant.helpers.debounce import Debouncer
+from homeassistant.helpers.device_registry import DeviceEntryType
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util.ssl import get_default_context, get_default_no_verify_context
 
-from .api import XenOrchestraAPI
-from .const import CONF_API_TOKEN, CONF_API_URL, CONF_SSL_VERIFY, DOMAIN
+from .api import XenOrchestraAPI, isTransientError
+from .const import (
+    CONF_API_TOKEN,
+    CONF_API_URL,
+    CONF_INVENTORY_INTERVAL,
+    CONF_POWER_INTERVAL,
+    CONF_PUSH_UPDATES,
+    CONF_SSL_VERIFY,
+    CONF_STATS_INTERVAL,
+    DEFAULT_INVENTORY_INTERVAL,
+    DEFAULT_POWER_INTERVAL,
+    DEFAULT_PUSH_UPDATES,
+    DEFAULT_STATS_INTERVAL,
+    DEVICE_PRUNE_GRACE_PERIOD,
+    DOMAIN,
+    HOST_STATS_FETCH_TIMEOUT,
+    INVENTORY_FETCH_TIMEOUT,
+    REFRESH_TIER_TOLERANCE,
+    REQUEST_REFRESH_COOLDOWN,
+    STALE_DATA_MAX_AGE,
+    STORAGE_KEY,
+    STORAGE_SAVE_DELAY,
+    STORAGE_VERSION,
+    TARGETED_REFRESH_WINDOW,
+    VM_STATE_RUNNING,
+    VM_STATS_BATCH_SIZE,
+    VM_STATS_FETCH_TIMEOUT,
+)
+from .jsonrpc import XenOrchestraJsonRpcClient
+from .models import HostState, PoolState, VMState
+from .services import async_setup_services, async_unload_services
+from .tasks import XenOrchestraTaskTracker
 
 _LOGGER = logging.getLogger(__name__)
 
+ModelT = TypeVar("ModelT", VMState, HostState, PoolState)
+
 PLATFORMS: list[Platform] = [Platform.SENSOR, Platform.SWITCH, Platform.BINARY_SENSOR, Platform.BUTTON]
 
+# Coordinator data key -> model of the devices created for its objects
+DEVICE_MODELS = {
+    "pools": "Pool",
+    "hosts": "XenServer Host",
+    "vms": "Virtual Machine",
+}
+
+# xo-server object type -> coordinator data key and the model parsed from it
+PUSH_COLLECTIONS: dict[str, tuple[str, type[VMState | HostState | PoolState]]] = {
+    "VM": ("vms", VMState),
+    "host": ("hosts", HostState),
+    "pool": ("pools", PoolState),
+}
+
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Xen Orchestra from a config entry."""
     api = XenOrchestraAPI(
@@ -28,26 +82,28 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         ssl_verify=entry.data.get(CONF_SSL_VERIFY, True),
     )
     
-    coordinator = XenOrchestraDataUpdateCoordinator(hass, api)
-    await coordinator.async_config_entry_first_refresh()
-    
+    coordinator = XenOrchestraDataUpdateCoordinator(
+        hass,
+        api,
+        power_interval=entry.options.get(CONF_POWER_INTERVAL, DEFAULT_POWER_INTERVAL),
+        stats_interval=entry.options.get(CONF_STATS_INTERVAL, DEFAULT_STATS_INTERVAL),
+        inventory_interval=entry.options.get(
+            CONF_INVENTORY_INTERVAL, DEFAULT_INVENTORY_INTERVAL
+        ),
+        store=Store(hass, STORAGE_VERSION, f"{STORAGE_KEY}.{entry.entry_id}"),
+    )
+
     # Store the config entry in coordinator for device updates
     coordinator.config_entry = entry
 
-    device_registry = dr.async_get(hass)
-    if coordinator.data:
-        for host_data in coordinator.data.get("hosts", []):
-            # Use 'uuid' for host identifier, which is standard for XOA API
-            host_id = host_data.get("uuid", host_data.get("id"))
-            if host_id:
-                device_registry.async_get_or_create(
-                    config_entry_id=entry.entry_id,
-                    identifiers={(DOMAIN, host_id)},
-                    name=host_data.get("name_label", "Unknown Host"),
-                    manufacturer="Vates",
-                    model="XenServer Host",
-                    entry_type=DeviceEntryType.SERVICE,
-                )
+    if await coordinator.async_load_cached_inventory():
+        # Entities come up from the cached inventory right away, unavailable
+        # until the live refresh running in the background succeeds.
+        hass.async_create_background_task(
+            coordinator.async_refresh(), f"{DOMAIN} initial refresh"
+        )
+    else:
+        await coordinator.async_config_entry_first_refresh()
 
     hass.data.setdefault(DOMAIN, {})
     hass.data[DOMAIN][entry.entry_id] = {
@@ -58,6 +114,10 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     entry.async_on_unload(entry.add_update_listener(async_reload_entry))
     
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    async_setup_services(hass)
+
+    if entry.options.get(CONF_PUSH_UPDATES, DEFAULT_PUSH_UPDATES):
+        coordinator.async_start_push(entry)
     
     return True
 
@@ -65,24 +125,46 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     if unload_ok:
-        # Close the API session
+        # Stop the event subscription and task tracking, close the API session
+        coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
+        await coordinator.async_stop_push()
+        await coordinator.tasks.async_stop()
         api = hass.data[DOMAIN][entry.entry_id]["api"]
         await api.close()
         
         # Remove the entry data
         hass.data[DOMAIN].pop(entry.entry_id)
+        async_unload_services(hass)
     
     return unload_ok
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the cached inventory of a deleted config entry."""
+    await Store(hass, STORAGE_VERSION, f"{STORAGE_KEY}.{entry.entry_id}").async_remove()
+
 async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
     """Handle an options update."""
     await hass.config_entries.async_reload(entry.entry_id)
 
 
 class XenOrchestraDataUpdateCoordinator(DataUpdateCoordinator):
-    """Class to manage fetching data from Xen Orchestra API."""
+    """Class to manage fetching data from Xen Orchestra API.
 
-    def __init__(self, hass: HomeAssistant, api: XenOrchestraAPI) -> None:
+    Data is refreshed in tiers, each on its own interval: VM power states,
+    stats and the full inventory (names, hosts, pools, device registry).
+    The update interval is the shortest of the three; every update only
+    fetches the tiers that are due.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        api: XenOrchestraAPI,
+        power_interval: int = DEFAULT_POWER_INTERVAL,
+        stats_interval: int = DEFAULT_STATS_INTERVAL,
+        inventory_interval: int = DEFAULT_INVENTORY_INTERVAL,
+        store: Store | None = None,
+    ) -> None:
         """Initialize."""
         self.api = api
         self.hass = hass
@@ -90,50 +172,874 @@ class XenOrchestraDataUpdateCoordinator(DataUpdateCoordinator):
             hass,
             _LOGGER,
             name=DOMAIN,
-            update_interval=timedelta(seconds=30),
+            update_interval=timedelta(
+                seconds=min(power_interval, stats_interval, inventory_interval)
+            ),
+            # Bursts of refresh requests, e.g. from automations acting on
+            # many VMs, run as a single refresh cycle
+            request_refresh_debouncer=Debouncer(
+                hass, _LOGGER, cooldown=REQUEST_REFRESH_COOLDOWN, immediate=False
+            ),
         )
+        self._power_interval = power_interval
+        self._stats_interval = stats_interval
+        self._inventory_interval = inventory_interval
+        # Monotonic times at which each tier is next due
+        self._power_due = 0.0
+        self._stats_due = 0.0
+        self._inventory_due = 0.0
+        # Last known inventory, persisted so entities exist before XO answers
+        self._store = store
+        self._push_client: XenOrchestraJsonRpcClient | None = None
+        self._push_task: asyncio.Task | None = None
+        self._push_notify_scheduled = False
+        # Bumped whenever pushed changes are applied, so a poll that ran
+        # meanwhile does not overwrite them with what it fetched before
+        self._push_generation = 0
+        # Fingerprints of the fields entities consume, keyed by object UUID
+        self._fingerprints: dict[str, int] = {}
+        # UUIDs changed in the current notification, None when all entities must update
+        self._changed_uuids: set[str] | None = None
+        self._last_notified_success: bool | None = None
+        self._last_notified_stale = False
+        # Monotonic time of the last refresh that succeeded
+        self._last_success = 0.0
+        # Number of enabled stats entities per VM; only these VMs get stats
+        self._vm_stats_subscribers: dict[str, int] = {}
+        # Follows the tasks started by VM actions
+        self.tasks = XenOrchestraTaskTracker(hass, self)
+        # Platform callbacks adding entities for new objects of a collection,
+        # each with the UUIDs it was already called for
+        self._object_listeners: list[
+            tuple[str, set[str], Callable[[list[Any]], None]]
+        ] = []
+        # Duration, request count and phase timings of the last refresh
+        self.refresh_metrics: dict[str, Any] = {}
+        self._phase_timings: dict[str, float] = {}
+        # Hash of the registry fields last written for each device, by UUID
+        self._device_fingerprints: dict[str, int] = {}
+        # Monotonic time since which the object of each known device is missing
+        self._missing_objects: dict[str, float] = {}
+        # VMs and hosts waiting for the next batched targeted refresh, and
+        # the future resolved once it ran
+        self._queued_vms: set[str] = set()
+        self._queued_hosts: set[str] = set()
+        self._queued_refresh: asyncio.Future | None = None
+
+    @property
+    def push_connected(self) -> bool:
+        """Return True while inventory changes arrive over the event subscription."""
+        return self._push_client is not None and self._push_client.connected
 
     async def _async_update_data(self) -> dict:
         """Fetch data from API."""
+        now = time.monotonic()
+        requests_before = self.api.metrics.requestCount
+        self._phase_timings = {}
+        push_generation = self._push_generation
         try:
-            vms = await self.api.getVMs()
-            hosts = await self.api.getHosts()
-            host_stats = {}
-            
-            # Update host devices in device registry
-            await self._update_host_devices(hosts)
-            
-            # Fetch host stats separately for easier access
-            for host in hosts:
-                host_id = host.get("uuid")
-                if host_id:
-                    try:
-                        stats = await self.api.getHostStats(host_id)
-                        host_stats[host_id] = stats
-                        _LOGGER.debug(f"Fetched stats for host {host_id}: {type(stats)}")
-                    except Exception as e:
-                        _LOGGER.warning(f"Failed to fetch stats for host {host_id}: {e}")
-                        host_stats[host_id] = {}
-            
-            _LOGGER.debug(f"Fetched {len(vms)} VMs and {len(hosts)} hosts")
-            return {"vms": vms, "hosts": hosts, "host_stats": host_stats}
+            data = dict(self.data) if self.data else {}
+            due = now + REFRESH_TIER_TOLERANCE
+            # While the event subscription is live it keeps VMs, hosts and
+            # pools current, only the stats still need polling.
+            inventory_due = not data or (
+                not self.push_connected and due >= self._inventory_due
+            )
+            stats_due = not data or due >= self._stats_due
+            # Without projection power states cost a full crawl of the VMs,
+            # so they only refresh with the inventory
+            power_due = (
+                not inventory_due
+                and not self.push_connected
+                and self.api.supportsProjection is not False
+                and due >= self._power_due
+            )
+
+            jobs = []
+            if inventory_due:
+                jobs.append(self._async_refresh_inventory(data, stats_due))
+            else:
+
+                async def _vms_then_stats() -> None:
+                    if power_due:
+                        await self._async_timed(
+                            "power_states", self._async_refresh_power_states(data)
+                        )
+                    if stats_due:
+                        await self._async_timed("vm_stats", self._async_refresh_vm_stats(data))
+
+                jobs.append(_vms_then_stats())
+                if stats_due:
+                    jobs.append(
+                        self._async_timed("host_stats", self._async_refresh_host_stats(data))
+                    )
+            await asyncio.gather(*jobs)
+
+            if self._push_generation != push_generation and self.data:
+                # Pushed changes that landed during the poll are newer than
+                # what it fetched; the subscription keeps them current
+                _LOGGER.debug("Objects were pushed during the refresh, keeping them")
+                for key in ("vms", "hosts", "pools"):
+                    data[key] = self.data[key]
+
+            if inventory_due or power_due:
+                # The inventory carries the power states as well
+                self._power_due = now + self._power_interval
+            if inventory_due:
+                self._inventory_due = now + self._inventory_interval
+                devices_start = time.monotonic()
+                self._async_sync_devices(data)
+                self._async_mark_missing_devices(data)
+                self._phase_timings["devices"] = round(time.monotonic() - devices_start, 3)
+                self._async_schedule_inventory_save(data)
+            if stats_due:
+                self._stats_due = now + self._stats_interval
+            self._async_prune_missing_objects(data)
+
+            tiers = [
+                name
+                for name, refreshed in (
+                    ("inventory", inventory_due),
+                    ("power states", power_due),
+                    ("stats", stats_due),
+                )
+                if refreshed
+            ]
+            _LOGGER.debug(
+                f"Refreshed {', '.join(tiers) or 'nothing due'}: "
+                f"{len(data['vms'])} VMs and {len(data['hosts'])} hosts"
+            )
+            data["stale"] = False
+            self._last_success = time.monotonic()
+            return data
         except Exception as err:
+            if (
+                self.data
+                and self.last_update_success
+                and isTransientError(err)
+                and now - self._last_success < STALE_DATA_MAX_AGE
+            ):
+                # A blip should not make every entity unavailable
+                _LOGGER.warning(f"Refresh failed, keeping the last known data as stale: {err}")
+                return {**self.data, "stale": True}
             _LOGGER.error(f"Error communicating with API: {err}")
             raise UpdateFailed(f"Error communicating with API: {err}") from err
+        finally:
+            self.refresh_metrics = {
+                "duration": round(time.monotonic() - now, 3),
+                "requests": self.api.metrics.requestCount - requests_before,
+                "phases": self._phase_timings,
+            }
 
-    async def _update_host_devices(self, hosts: list) -> None:
-        """Update host devices in device registry."""
-        device_registry = dr.async_get(self.hass)
-        
-        for host_data in hosts:
-            host_id = host_data.get("uuid", host_data.get("id"))
-            if host_id:
-                # Get or create the device - this will update it if it exists
-                device_registry.async_get_or_create(
-                    config_entry_id=self.config_entry.entry_id,
-                    identifiers={(DOMAIN, host_id)},
-                    name=host_data.get("name_label", "Unknown Host"),
-                    manufacturer="Vates",
-                    model="XenServer Host",
-                    entry_type=DeviceEntryType.SERVICE,
-                )
\ No newline at end of file
+    async def _async_timed(self, phase: str, job: Awaitable[Any]) -> Any:
+        """Await a refresh phase and record how long it took."""
+        start = time.monotonic()
+        try:
+            return await job
+        finally:
+            self._phase_timings[phase] = round(time.monotonic() - start, 3)
+
+    async def _async_refresh_inventory(self, data: dict, with_stats: bool) -> None:
+        """Fetch VMs, pools and hosts concurrently, then their stats."""
+
+        async def _vms_then_stats() -> None:
+            data["vms"] = await self._async_timed(
+                "vms", self._async_fetch_inventory(self.api.getVMs)
+            )
+            if with_stats:
+                await self._async_timed("vm_stats", self._async_refresh_vm_stats(data))
+
+        async def _hosts_then_stats() -> None:
+            data["hosts"] = await self._async_timed(
+                "hosts", self._async_fetch_inventory(self.api.getHosts)
+            )
+            if with_stats:
+                await self._async_timed("host_stats", self._async_refresh_host_stats(data))
+
+        _, data["pools"], _ = await asyncio.gather(
+            _vms_then_stats(),
+            self._async_timed("pools", self._async_fetch_inventory(self.api.getPools)),
+            _hosts_then_stats(),
+        )
+        data.setdefault("host_stats", {})
+        data.setdefault("stale_hosts", set())
+        data.setdefault("vm_stats", {})
+
+    async def _async_refresh_power_states(self, data: dict) -> None:
+        """Merge the latest VM power states into the known VMs."""
+        states = await asyncio.wait_for(
+            self.api.getVMPowerStates(), INVENTORY_FETCH_TIMEOUT
+        )
+        vms = data["vms"]
+        merged: dict[str, VMState] = {}
+        for vm_id, power_state in states.items():
+            current = vms.get(vm_id)
+            if current is None:
+                # Unknown VM, pick up its metadata on the next update
+                self._inventory_due = 0.0
+                continue
+            if current.power_state == power_state:
+                merged[vm_id] = current
+            else:
+                merged[vm_id] = dataclasses.replace(current, power_state=power_state)
+        data["vms"] = merged
+
+    async def _async_refresh_host_stats(self, data: dict) -> None:
+        """Fetch the stats of the known hosts."""
+        data["host_stats"], data["stale_hosts"] = await self._async_fetch_host_stats(
+            data["hosts"]
+        )
+
+    async def _async_refresh_vm_stats(self, data: dict) -> None:
+        """Fetch stats for the running VMs that have enabled stats entities.
+
+        VMs are swept in batches so a large selection never queues hundreds
+        of requests at once; a VM whose fetch times out keeps its previous
+        stats.
+        """
+        previous = data.get("vm_stats", {})
+        vm_ids = [
+            vm_id
+            for vm_id in self._vm_stats_subscribers
+            if vm_id in data["vms"]
+            and data["vms"][vm_id].power_state == VM_STATE_RUNNING
+        ]
+        vm_stats: dict[str, dict] = {}
+        for start in range(0, len(vm_ids), VM_STATS_BATCH_SIZE):
+            batch = vm_ids[start : start + VM_STATS_BATCH_SIZE]
+            results = await asyncio.gather(
+                *(
+                    asyncio.wait_for(self.api.getVMStats(vm_id), VM_STATS_FETCH_TIMEOUT)
+                    for vm_id in batch
+                ),
+                return_exceptions=True,
+            )
+            for vm_id, result in zip(batch, results):
+                if isinstance(result, asyncio.TimeoutError):
+                    _LOGGER.warning(
+                        f"Timed out fetching stats for VM {vm_id}, keeping previous values"
+                    )
+                    vm_stats[vm_id] = previous.get(vm_id, {})
+                elif isinstance(result, Exception):
+                    _LOGGER.warning(f"Failed to fetch stats for VM {vm_id}: {result}")
+                else:
+                    vm_stats[vm_id] = result
+        data["vm_stats"] = vm_stats
+        _LOGGER.debug(f"Fetched stats for {len(vm_stats)} of {len(vm_ids)} selected VMs")
+
+    async def _async_fetch_inventory(
+        self, fetch: Callable[[], Awaitable[list[ModelT]]]
+    ) -> dict[str, ModelT]:
+        """Fetch one inventory collection within its deadline."""
+        return _index_by_uuid(await asyncio.wait_for(fetch(), INVENTORY_FETCH_TIMEOUT))
+
+    async def _async_fetch_host_stats(
+        self, hosts: dict[str, HostState]
+    ) -> tuple[dict[str, dict], set[str]]:
+        """Fetch the stats of every host concurrently, each with its own deadline.
+
+        A host that misses the deadline or whose fetch failed keeps its
+        previous stats and is reported as stale rather than failing the
+        whole refresh.
+        """
+        previous = self.data.get("host_stats", {}) if self.data else {}
+
+        async def _fetch(host_id: str) -> dict:
+            return await asyncio.wait_for(
+                self.api.getHostStats(host_id), HOST_STATS_FETCH_TIMEOUT
+            )
+
+        host_ids = list(hosts)
+        results = await asyncio.gather(
+            *(_fetch(host_id) for host_id in host_ids), return_exceptions=True
+        )
+
+        host_stats: dict[str, dict] = {}
+        stale_hosts: set[str] = set()
+        for host_id, result in zip(host_ids, results):
+            if isinstance(result, asyncio.TimeoutError):
+                _LOGGER.warning(
+                    f"Timed out fetching stats for host {host_id}, keeping previous values"
+                )
+                host_stats[host_id] = previous.get(host_id, {})
+                stale_hosts.add(host_id)
+            elif isinstance(result, Exception) or (not result and previous.get(host_id)):
+                # getHostStats reports its own failures as empty stats
+                _LOGGER.warning(
+                    f"Failed to fetch stats for host {host_id}, keeping previous values"
+                )
+                host_stats[host_id] = previous.get(host_id, {})
+                if host_stats[host_id]:
+                    stale_hosts.add(host_id)
+            else:
+                host_stats[host_id] = result
+                _LOGGER.debug(f"Fetched stats for host {host_id}: {type(result)}")
+        return host_stats, stale_hosts
+
+    @callback
+    def _async_sync_devices(self, data: dict) -> None:
+        """Create or update the devices of pools, hosts and VMs that changed.
+
+        Each device is fingerprinted by the fields written to the registry,
+        so a refresh only touches devices that are new or were renamed or
+        moved; pools go first so hosts can link to them, then hosts for VMs.
+        """
+        registry = dr.async_get(self.hass)
+        fingerprints: dict[str, int] = {}
+        updated = 0
+        for uuid, device in _device_infos(data):
+            fingerprint = hash(tuple(device.items()))
+            fingerprints[uuid] = fingerprint
+            if self._device_fingerprints.get(uuid) == fingerprint:
+                continue
+            updated += 1
+            via_device = device.pop("via_device")
+            registry.async_get_or_create(
+                config_entry_id=self.config_entry.entry_id,
+                identifiers={(DOMAIN, uuid)},
+                manufacturer="Vates",
+                via_device=(DOMAIN, via_device) if via_device else None,
+                **device,
+            )
+        if updated:
+            _LOGGER.debug(f"Synced {updated} of {len(fingerprints)} devices")
+        self._device_fingerprints = fingerprints
+
+    @callback
+    def async_add_object_listener(
+        self, key: str, add_objects: Callable[[list[Any]], None]
+    ) -> Callable[[], None]:
+        """Call add_objects with the objects of a collection it has not seen yet.
+
+        It is called right away for the current objects and then after every
+        update that brings new ones, so platforms add entities without a
+        reload. Objects whose devices are pruned are offered again if they
+        come back.
+        """
+        listener = (key, set(), add_objects)
+        self._object_listeners.append(listener)
+        self._async_add_new_objects([listener])
+
+        @callback
+        def _remove_listener() -> None:
+            self._object_listeners.remove(listener)
+
+        return _remove_listener
+
+    @callback
+    def _async_add_new_objects(
+        self, listeners: list[tuple[str, set[str], Callable[[list[Any]], None]]]
+    ) -> None:
+        """Hand the objects each listener has not seen yet to it."""
+        if not self.data:
+            return
+        for key, known, add_objects in listeners:
+            new = [
+                obj for uuid, obj in self.data.get(key, {}).items() if uuid not in known
+            ]
+            if new:
+                known.update(obj.uuid for obj in new)
+                add_objects(new)
+
+    @callback
+    def _async_mark_missing_devices(self, data: dict) -> None:
+        """Start the grace period of devices whose objects a listing lacks.
+
+        Collections listed empty are skipped: xo-server more likely lost its
+        pools than every object was deleted.
+        """
+        models = {model for key, model in DEVICE_MODELS.items() if data.get(key)}
+        present = {uuid for key in DEVICE_MODELS for uuid in data.get(key, {})}
+        missing = []
+        registry = dr.async_get(self.hass)
+        for device in dr.async_entries_for_config_entry(
+            registry, self.config_entry.entry_id
+        ):
+            # The device of the Xen Orchestra instance itself has no model here
+            if device.model not in models:
+                continue
+            for domain, uuid in device.identifiers:
+                if domain == DOMAIN and uuid not in present:
+                    missing.append(uuid)
+        self._async_mark_missing(missing)
+
+    @callback
+    def _async_mark_missing(self, uuids: Iterable[str]) -> None:
+        """Record objects as missing, keeping the time they were first missed."""
+        now = time.monotonic()
+        for uuid in uuids:
+            self._missing_objects.setdefault(uuid, now)
+
+    @callback
+    def _async_prune_missing_objects(self, data: dict) -> None:
+        """Remove devices of objects missing for longer than the grace period.
+
+        Objects that came back, for instance once xo-server reconnected to
+        their pool, keep their devices and entity customisations.
+        """
+        if not self._missing_objects:
+            return
+        now = time.monotonic()
+        expired = []
+        for uuid, since in list(self._missing_objects.items()):
+            if any(uuid in data.get(key, {}) for key in DEVICE_MODELS):
+                del self._missing_objects[uuid]
+            elif now - since >= DEVICE_PRUNE_GRACE_PERIOD:
+                expired.append(uuid)
+        self._async_remove_objects(expired)
+
+    @callback
+    def _async_remove_objects(self, uuids: Iterable[str]) -> None:
+        """Remove the devices, and with them the entities, of deleted objects."""
+        registry = dr.async_get(self.hass)
+        for uuid in uuids:
+            self._missing_objects.pop(uuid, None)
+            for _, known, _ in self._object_listeners:
+                known.discard(uuid)
+            device = registry.async_get_device(identifiers={(DOMAIN, uuid)})
+            if device is not None and self.config_entry.entry_id in device.config_entries:
+                _LOGGER.info(f"Removing device {device.name} ({uuid}), no longer in Xen Orchestra")
+                registry.async_remove_device(device.id)
+
+    async def async_load_cached_inventory(self) -> bool:
+        """Load the persisted inventory as unavailable data, if there is one."""
+        if self._store is None:
+            return False
+        try:
+            cached = await self._store.async_load()
+            if not cached:
+                return False
+            data = {
+                "vms": _index_by_uuid([VMState(**vm) for vm in cached["vms"]]),
+                "hosts": _index_by_uuid([HostState(**host) for host in cached["hosts"]]),
+                "pools": _index_by_uuid([PoolState(**pool) for pool in cached["pools"]]),
+                "host_stats": {},
+                "stale_hosts": set(),
+                "vm_stats": {},
+            }
+        except (KeyError, TypeError) as err:
+            _LOGGER.warning(f"Ignoring unreadable cached inventory: {err}")
+            return False
+
+        _LOGGER.debug(
+            f"Loaded cached inventory with {len(data['vms'])} VMs and {len(data['hosts'])} hosts"
+        )
+        self.data = data
+        self.last_update_success = False
+        return True
+
+    @callback
+    def _async_schedule_inventory_save(self, data: dict) -> None:
+        """Persist the inventory after a quiet period."""
+        if self._store is None:
+            return
+
+        def _snapshot() -> dict:
+            return {
+                key: [dataclasses.asdict(obj) for obj in data[key].values()]
+                for key in ("vms", "hosts", "pools")
+            }
+
+        self._store.async_delay_save(_snapshot, STORAGE_SAVE_DELAY)
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Add entities for new objects and work out which objects changed."""
+        if self.last_update_success:
+            self._async_add_new_objects(self._object_listeners)
+        self._changed_uuids = self._async_diff_data()
+        super().async_update_listeners()
+
+    @callback
+    def async_object_changed(self, uuid: str, stats: bool = False) -> bool:
+        """Return True if entities of the given object need to write their state.
+
+        VM stats are fingerprinted apart from the VM, so only entities
+        passing stats=True write their state when just the stats changed.
+        """
+        if self._changed_uuids is None or uuid in self._changed_uuids:
+            return True
+        return stats and _stats_key(uuid) in self._changed_uuids
+
+    @callback
+    def _async_diff_data(self) -> set[str] | None:
+        """Compare the current data with the previous notification."""
+        fingerprints = self._fingerprint_data()
+        previous, self._fingerprints = self._fingerprints, fingerprints
+
+        if (
+            self.last_update_success != self._last_notified_success
+            or self.is_stale != self._last_notified_stale
+        ):
+            # Availability and the stale attribute of every entity depend on these
+            self._last_notified_success = self.last_update_success
+            self._last_notified_stale = self.is_stale
+            return None
+
+        changed = {
+            uuid
+            for uuid, fingerprint in fingerprints.items()
+            if previous.get(uuid) != fingerprint
+        }
+        # Removed objects make their entities unavailable
+        changed.update(previous.keys() - fingerprints.keys())
+        _LOGGER.debug(f"{len(changed)} of {len(fingerprints)} objects changed")
+        return changed
+
+    def _fingerprint_data(self) -> dict[str, int]:
+        """Hash the fields entities consume for every VM and host.
+
+        The stats of a VM get their own key, so a stats sweep leaves the
+        other entities of the VM alone.
+        """
+        if not self.data:
+            return {}
+        fingerprints: dict[str, int] = {}
+        vm_stats = self.data.get("vm_stats", {})
+        for vm_id, vm in self.data.get("vms", {}).items():
+            fingerprints[vm_id] = hash(vm.power_state)
+            if vm_id in vm_stats:
+                fingerprints[_stats_key(vm_id)] = _fingerprint_stats(vm_stats[vm_id])
+        host_stats = self.data.get("host_stats", {})
+        stale_hosts = self.data.get("stale_hosts", set())
+        for host_id in self.data.get("hosts", {}):
+            fingerprints[host_id] = hash(
+                (
+                    _fingerprint_stats(host_stats.get(host_id)),
+                    host_id in stale_hosts,
+                )
+            )
+        return fingerprints
+
+    async def async_refresh_objects(
+        self, vms: Iterable[str] = (), hosts: Iterable[str] = ()
+    ) -> None:
+        """Fetch only the given VMs and hosts and merge them into the data.
+
+        Hosts are refreshed together with their stats. Only the entities of
+        objects that actually changed write their state; if any fetch fails
+        a regular refresh is requested instead.
+        """
+        if not self.data:
+            return
+        vm_ids = list(dict.fromkeys(vms))
+        host_ids = list(dict.fromkeys(hosts))
+        try:
+            vm_states, host_states = await asyncio.wait_for(
+                asyncio.gather(
+                    asyncio.gather(*(self.api.getVM(uuid) for uuid in vm_ids)),
+                    asyncio.gather(*(self.api.getHost(uuid) for uuid in host_ids)),
+                ),
+                INVENTORY_FETCH_TIMEOUT,
+            )
+        except Exception as err:
+            _LOGGER.debug(f"Targeted refresh failed, requesting a full refresh: {err}")
+            self._power_due = 0.0
+            await self.async_request_refresh()
+            return
+
+        if host_ids:
+            host_stats, stale_hosts = await self._async_fetch_host_stats(
+                {uuid: state for uuid, state in zip(host_ids, host_states) if state is not None}
+            )
+
+        # Merge into the data as it is now, a refresh or pushed changes may
+        # have landed while the objects were fetched
+        if not self.data:
+            return
+        data = dict(self.data)
+        if vm_ids:
+            data["vms"] = _merge_by_uuid(data.get("vms", {}), vm_ids, vm_states)
+        if host_ids:
+            data["hosts"] = _merge_by_uuid(data.get("hosts", {}), host_ids, host_states)
+            data["host_stats"] = {**data.get("host_stats", {}), **host_stats}
+            data["stale_hosts"] = (data.get("stale_hosts", set()) - set(host_ids)) | stale_hosts
+        self.data = data
+        self._async_sync_devices(data)
+        # Objects answered with a 404 are dropped from the data, their
+        # devices wait for the grace period like any missing object
+        self._async_mark_missing(
+            uuid
+            for uuid, state in zip(vm_ids + host_ids, [*vm_states, *host_states])
+            if state is None
+        )
+        self.async_update_listeners()
+
+    async def async_refresh_vm(self, uuid: str) -> None:
+        """Fetch a single VM and notify its entities if it changed."""
+        await self._async_queue_refresh(vms=(uuid,))
+
+    async def async_refresh_host(self, uuid: str) -> None:
+        """Fetch a single host with its stats and notify its entities if they changed."""
+        await self._async_queue_refresh(hosts=(uuid,))
+
+    async def _async_queue_refresh(
+        self, vms: Iterable[str] = (), hosts: Iterable[str] = ()
+    ) -> None:
+        """Refresh objects together with those queued within a short window.
+
+        The first caller waits TARGETED_REFRESH_WINDOW and then refreshes
+        every queued VM and host at once; later callers await that refresh.
+        """
+        self._queued_vms.update(vms)
+        self._queued_hosts.update(hosts)
+        if self._queued_refresh is not None:
+            await asyncio.shield(self._queued_refresh)
+            return
+
+        done = self._queued_refresh = self.hass.loop.create_future()
+        try:
+            await asyncio.sleep(TARGETED_REFRESH_WINDOW)
+            vm_ids, self._queued_vms = self._queued_vms, set()
+            host_ids, self._queued_hosts = self._queued_hosts, set()
+            self._queued_refresh = None
+            await self.async_refresh_objects(vms=vm_ids, hosts=host_ids)
+        finally:
+            if self._queued_refresh is done:
+                self._queued_refresh = None
+            done.set_result(None)
+
+    @callback
+    def async_track_action(
+        self,
+        vm_id: str,
+        action: str,
+        task_id: str | None,
+        on_done: Callable[[str | None], None] | None = None,
+    ) -> None:
+        """Refresh a VM once the task started by an action on it has ended.
+
+        on_done is called after that refresh with the final task status, or
+        None when there is no task to follow.
+        """
+        if task_id:
+            self.tasks.async_track(task_id, vm_id, action, on_done)
+            return
+
+        async def _refresh() -> None:
+            # xo-server did not report a task, the VM state may already be final
+            await self.async_refresh_vm(vm_id)
+            if on_done is not None:
+                on_done(None)
+
+        self.hass.async_create_task(_refresh())
+
+    @callback
+    def get_vm(self, uuid: str) -> VMState | None:
+        """Return the current data of a VM."""
+        return self.data.get("vms", {}).get(uuid) if self.data else None
+
+    @callback
+    def get_host(self, uuid: str) -> HostState | None:
+        """Return the current data of a host."""
+        return self.data.get("hosts", {}).get(uuid) if self.data else None
+
+    @callback
+    def get_pool(self, uuid: str) -> PoolState | None:
+        """Return the current data of a pool."""
+        return self.data.get("pools", {}).get(uuid) if self.data else None
+
+    @callback
+    def get_host_stats(self, uuid: str) -> dict | None:
+        """Return the latest stats of a host."""
+        return self.data.get("host_stats", {}).get(uuid) if self.data else None
+
+    @callback
+    def get_vm_stats(self, uuid: str) -> dict | None:
+        """Return the latest stats of a VM, if it is selected for stats."""
+        return self.data.get("vm_stats", {}).get(uuid) if self.data else None
+
+    @callback
+    def async_subscribe_vm_stats(self, uuid: str) -> Callable[[], None]:
+        """Include a VM in the stats sweeps until the returned callback is called."""
+        self._vm_stats_subscribers[uuid] = self._vm_stats_subscribers.get(uuid, 0) + 1
+
+        @callback
+        def _unsubscribe() -> None:
+            remaining = self._vm_stats_subscribers.pop(uuid, 1) - 1
+            if remaining > 0:
+                self._vm_stats_subscribers[uuid] = remaining
+
+        return _unsubscribe
+
+    @callback
+    def is_host_stale(self, uuid: str) -> bool:
+        """Return True if a host's stats are left over from an earlier refresh."""
+        return self.is_stale or (
+            bool(self.data) and uuid in self.data.get("stale_hosts", set())
+        )
+
+    @property
+    def is_stale(self) -> bool:
+        """Return True while the data is kept from before failed refreshes."""
+        return bool(self.data) and self.data.get("stale", False)
+
+    @callback
+    def async_start_push(self, entry: ConfigEntry) -> None:
+        """Start the xo-server event subscription."""
+        self._push_client = XenOrchestraJsonRpcClient(
+            api_url=entry.data[CONF_API_URL],
+            api_token=entry.data[CONF_API_TOKEN],
+            # Home Assistant's shared contexts, creating one blocks the loop
+            ssl_context=(
+                get_default_context()
+                if entry.data.get(CONF_SSL_VERIFY, True)
+                else get_default_no_verify_context()
+            ),
+            on_snapshot=self._async_handle_push_snapshot,
+            on_objects=self._async_handle_push_objects,
+            on_connection=self._async_handle_push_connection,
+        )
+        self._push_task = self.hass.async_create_background_task(
+            self._push_client.run(), f"{DOMAIN} event subscription"
+        )
+
+    async def async_stop_push(self) -> None:
+        """Stop the xo-server event subscription."""
+        if self._push_task is None:
+            return
+        self._push_client.stop()
+        self._push_task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._push_task
+        self._push_task = None
+        self._push_client = None
+
+    @callback
+    def _async_handle_push_snapshot(self, objects: list[dict]) -> None:
+        """Replace VMs, hosts and pools with the snapshot loaded on (re)connect."""
+        if self.data is None:
+            return
+        collections: dict[str, dict] = {key: {} for key, _ in PUSH_COLLECTIONS.values()}
+        for obj in objects:
+            key, model = PUSH_COLLECTIONS[obj["type"]]
+            if obj.get("uuid"):
+                collections[key][obj["uuid"]] = model.from_dict(obj)
+        self._push_generation += 1
+        self.data = {**self.data, **collections}
+        self._async_sync_devices(self.data)
+        self._async_mark_missing_devices(self.data)
+        self._async_schedule_inventory_save(self.data)
+        self._async_schedule_push_notify()
+
+    @callback
+    def _async_handle_push_objects(self, event_type: str, items: list[dict]) -> None:
+        """Apply object changes pushed by xo-server to the coordinator data."""
+        if self.data is None:
+            return
+        changed = False
+        removed: list[str] = []
+        for obj in items:
+            key, model = PUSH_COLLECTIONS[obj["type"]]
+            objects = self.data[key]
+            uuid = obj.get("uuid")
+            if not uuid:
+                continue
+            if event_type == "exit":
+                if objects.pop(uuid, None) is not None:
+                    changed = True
+                removed.append(uuid)
+                continue
+
+            state = model.from_dict(obj)
+            if objects.get(uuid) != state:
+                objects[uuid] = state
+                changed = True
+
+        if changed or removed:
+            self._push_generation += 1
+
+        # xo-server also sends exit for every object of a pool it lost the
+        # connection to, so devices only go after the grace period
+        self._async_mark_missing(removed)
+        if changed:
+            self._async_sync_devices(self.data)
+            self._async_schedule_inventory_save(self.data)
+            self._async_schedule_push_notify()
+
+    @callback
+    def _async_handle_push_connection(self, connected: bool) -> None:
+        """Fall back to polling the inventory while the subscription is down."""
+        if connected:
+            _LOGGER.info("Receiving inventory changes from Xen Orchestra events")
+        else:
+            _LOGGER.warning("Xen Orchestra event subscription lost, falling back to polling")
+            # Changes may have been missed while the subscription was down
+            self._inventory_due = 0.0
+            self.hass.async_create_task(self.async_request_refresh())
+
+    @callback
+    def _async_schedule_push_notify(self) -> None:
+        """Notify entities once for a burst of pushed changes."""
+        if not self._push_notify_scheduled:
+            self._push_notify_scheduled = True
+            self.hass.loop.call_soon(self._async_flush_push_notify)
+
+    @callback
+    def _async_flush_push_notify(self) -> None:
+        """Write entity states after pushed changes."""
+        self._push_notify_scheduled = False
+        # async_update_listeners does not reschedule the polling timer, so
+        # host stats keep refreshing on their own cadence.
+        self.async_update_listeners()
+
+
+def _stats_key(uuid: str) -> str:
+    """Return the fingerprint key of the stats of a VM."""
+    return f"{uuid}:stats"
+
+
+def _fingerprint_stats(stats: Any) -> int:
+    """Hash a compacted stats payload, which only holds the latest samples."""
+    return hash(_freeze(stats or None))
+
+
+def _freeze(value: Any) -> Any:
+    """Turn nested stats dicts and lists into hashable tuples."""
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def _device_infos(data: dict) -> Iterable[tuple[str, dict[str, Any]]]:
+    """Yield the registry fields of every pool, host and VM device, parents first."""
+    for pool in data.get("pools", {}).values():
+        yield pool.uuid, {
+            "name": pool.name_label,
+            "model": DEVICE_MODELS["pools"],
+            "entry_type": DeviceEntryType.SERVICE,
+            "via_device": None,
+        }
+    for host in data.get("hosts", {}).values():
+        yield host.uuid, {
+            "name": host.name_label,
+            "model": DEVICE_MODELS["hosts"],
+            "entry_type": DeviceEntryType.SERVICE,
+            "via_device": host.pool,
+        }
+    for vm in data.get("vms", {}).values():
+        yield vm.uuid, {
+            "name": vm.name_label,
+            "model": DEVICE_MODELS["vms"],
+            "via_device": vm.container,
+        }
+
+
+def _merge_by_uuid(
+    current: dict[str, ModelT], uuids: list[str], states: list[ModelT | None]
+) -> dict[str, ModelT]:
+    """Return a copy of an index with fetched objects replaced or removed."""
+    merged = dict(current)
+    for uuid, state in zip(uuids, states):
+        if state is None:
+            merged.pop(uuid, None)
+        else:
+            merged[uuid] = state
+    return merged
+
+
+def _index_by_uuid(objects: list[ModelT]) -> dict[str, ModelT]:
+    """Key API objects by UUID for constant time lookups."""
+    return {obj.uuid: obj for obj in objects}
@@ -2,31 +2,150 @@
 from __future__ import annotations
 
 import asyncio
+import functools
 import logging
-from typing import Any, Dict, List
+import random
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List
 
 import aiohttp
 
+from .connection import acquireConnector, getConnectorDiagnostics, releaseConnector
+from .const import (
+    API_ENDPOINT_HOSTS,
+    API_ENDPOINT_POOLS,
+    API_ENDPOINT_TASKS,
+    API_ENDPOINT_VMS,
+    CIRCUIT_FAILURE_THRESHOLD,
+    CIRCUIT_RESET_TIMEOUT,
+    DEFAULT_MAX_CONCURRENCY,
+    DEFAULT_REQUEST_TIMEOUT,
+    DEFAULT_STATS_WINDOW,
+    EXECUTOR_DECODE_MIN_SIZE,
+    HOST_CACHE_TTL,
+    HOST_FIELDS,
+    INTERACTIVE_RESERVED_SLOTS,
+    POOL_CACHE_TTL,
+    POOL_FIELDS,
+    REQUEST_RETRY_ATTEMPTS,
+    REQUEST_RETRY_BASE_DELAY,
+    REQUEST_RETRY_MAX_DELAY,
+    STATS_GRANULARITY,
+    STREAM_CHUNK_SIZE,
+    STREAM_DECODE_MIN_SIZE,
+    VM_FIELDS,
+)
+from .decoding import DECODER, JsonArrayParser, loads
+from .metrics import RequestMetrics, RequestSample
+from .models import HostState, PoolState, VMState
+from .scheduler import (
+    PRIORITY_BACKGROUND,
+    PRIORITY_INTERACTIVE,
+    AdaptiveRequestScheduler,
+    CircuitBreaker,
+    CircuitOpenError,
+    XenOrchestraAPIError,
+)
+
 _LOGGER = logging.getLogger(__name__)
 
+DEFAULT_FIELDS: Dict[str, tuple[str, ...]] = {
+    API_ENDPOINT_VMS: VM_FIELDS,
+    API_ENDPOINT_HOSTS: HOST_FIELDS,
+    API_ENDPOINT_POOLS: POOL_FIELDS,
+}
+
+
+@dataclass
+class _CachedResponse:
+    """A decoded GET response with the validators xo-server sent for it."""
+
+    body: Any
+    etag: str | None
+    lastModified: str | None
+    # Monotonic time until which the body is reused without revalidation
+    expires: float
+
 
 class XenOrchestraAPI:
     """API client for Xen Orchestra."""
 
-    def __init__(self, api_url: str, api_token: str, ssl_verify: bool = True) -> None:
+    def __init__(
+        self,
+        api_url: str,
+        api_token: str,
+        ssl_verify: bool = True,
+        fields: Dict[str, tuple[str, ...]] | None = None,
+        request_timeout: float = DEFAULT_REQUEST_TIMEOUT,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        stats_window: int = DEFAULT_STATS_WINDOW,
+        compression: bool = True,
+    ) -> None:
         """Initialize the API client."""
         self._api_url = api_url.rstrip("/")
         self._api_token = api_token
         self._ssl_verify = ssl_verify
         self._session: aiohttp.ClientSession | None = None
+        # Whether this client holds a reference on the shared connection pool
+        self._connectorAcquired = False
+        self._compression = compression
+        # Fields requested per collection endpoint when projection is available
+        self._fields = {**DEFAULT_FIELDS, **(fields or {})}
+        # None until the first collection request tells us whether xo-server
+        # honours ?fields=; older versions ignore it and return paths only.
+        self._supportsProjection: bool | None = None
+        self._requestTimeout = aiohttp.ClientTimeout(total=request_timeout)
+        # Number of samples kept from each RRD series in stats responses
+        self._statsWindow = max(1, stats_window)
+        # Every request goes through the scheduler so large crawls cannot
+        # flood xo-server; its width adapts to latency and overload errors.
+        # Actions and targeted refreshes jump the queue and have slots of
+        # their own on top of that width, so their latency does not depend
+        # on the refresh size.
+        self._scheduler = AdaptiveRequestScheduler(
+            max_limit=max_concurrency, reserved=INTERACTIVE_RESERVED_SLOTS
+        )
+        # Collection listings and host and pool GET responses keyed by
+        # endpoint and query, reused while their TTL lasts, if any, and
+        # then revalidated with If-None-Match/If-Modified-Since
+        self._responseCache: Dict[str, _CachedResponse] = {}
+        self._cacheStats = {"fresh_hits": 0, "not_modified": 0, "misses": 0}
+        # Latency, size and error counters per endpoint class
+        self.metrics = RequestMetrics()
+        # Fails requests fast while xo-server keeps timing out or erroring
+        self._breaker = CircuitBreaker(CIRCUIT_FAILURE_THRESHOLD, CIRCUIT_RESET_TIMEOUT)
+        self._retries = 0
+        # GETs being sent, shared with identical GETs made meanwhile
+        self._inFlightGets: Dict[tuple, asyncio.Future] = {}
+        self._coalescedGets = 0
+        # Last model parsed from every object path, served when a later
+        # fetch of that object fails
+        self._lastKnownDetails: Dict[str, Any] = {}
+
+    @property
+    def supportsProjection(self) -> bool | None:
+        """Return whether the REST collections support field projection."""
+        return self._supportsProjection
 
     async def _ensureSession(self) -> aiohttp.ClientSession:
         """Ensure we have an active session with the auth cookie."""
         if self._session is None or self._session.closed:
-            connector = aiohttp.TCPConnector(ssl=self._ssl_verify)
+            if self._connectorAcquired:
+                await releaseConnector(self._api_url, self._ssl_verify)
+            # Keep-alive connections are pooled per XO host across clients,
+            # the session only carries this client's cookie and headers.
+            connector = acquireConnector(self._api_url, self._ssl_verify)
+            self._connectorAcquired = True
             cookies = {"authenticationToken": self._api_token}
+            headers = {
+                "Accept-Encoding": "gzip, deflate" if self._compression else "identity"
+            }
             self._session = aiohttp.ClientSession(
-                connector=connector, cookies=cookies
+                connector=connector,
+                connector_owner=False,
+                cookies=cookies,
+                headers=headers,
             )
         return self._session
 
@@ -40,42 +159,276 @@ class XenOrchestraAPI:
             raise
 
     async def _makeRequest(
-        self, method: str, endpoint: str, data: Dict[str, Any] = None
+        self,
+        method: str,
+        endpoint: str,
+        data: Dict[str, Any] = None,
+        params: Dict[str, str] | None = None,
+        cache_ttl: float = 0,
+        item_factory: Callable[[Any], Any] | None = None,
+        priority: int | None = None,
+        revalidate: bool = False,
+    ) -> Any:
+        """Make an authenticated request to the API.
+
+        GET responses are cached only when cache_ttl or revalidate is given:
+        a body younger than cache_ttl is returned without a request,
+        otherwise the request carries the validators of the cached body and
+        a 304 answer reuses it. With revalidate alone every call is sent,
+        which suits the VM listings: they change too often to be reused
+        blindly, but an unchanged one costs no body. Stats and tasks are
+        never kept.
+
+        When item_factory is given and the body is a JSON array, each element
+        is passed through it as soon as it is decoded (None results are
+        dropped) and the list of results is returned and cached instead.
+
+        GETs failing transiently are retried with jittered exponential
+        backoff; nothing is sent while the circuit breaker is open. A GET
+        identical to one in flight awaits that request instead of sending
+        its own.
+
+        Actions are sent with interactive priority and other requests in
+        the background unless a priority is given.
+        """
+        if priority is None:
+            priority = PRIORITY_BACKGROUND if method == "GET" else PRIORITY_INTERACTIVE
+        cache_key = None
+        cached = None
+        if method == "GET":
+            cache_key = _cacheKey(endpoint, params)
+            if cache_ttl > 0 or revalidate:
+                cached = self._responseCache.get(cache_key)
+            if cached is not None and cached.expires > time.monotonic():
+                self._cacheStats["fresh_hits"] += 1
+                return cached.body
+
+            key = (cache_key, item_factory, priority)
+            pending = self._inFlightGets.get(key)
+            if pending is not None:
+                self._coalescedGets += 1
+                return await asyncio.shield(pending)
+            pending = asyncio.ensure_future(
+                self._sendWithRetries(
+                    method, endpoint, data, params, cache_key, cached, cache_ttl, item_factory,
+                    priority, revalidate,
+                )
+            )
+            self._inFlightGets[key] = pending
+            pending.add_done_callback(lambda future: self._forgetInFlight(key, future))
+            # Shielded so a cancelled caller does not fail the other awaiters
+            return await asyncio.shield(pending)
+
+        return await self._sendWithRetries(
+            method, endpoint, data, params, cache_key, cached, cache_ttl, item_factory, priority,
+            revalidate,
+        )
+
+    def _forgetInFlight(self, key: tuple, future: asyncio.Future) -> None:
+        """Drop a finished GET from the in-flight requests."""
+        if self._inFlightGets.get(key) is future:
+            del self._inFlightGets[key]
+        if not future.cancelled():
+            # Mark the error retrieved when every awaiter was cancelled
+            future.exception()
+
+    async def _sendWithRetries(
+        self,
+        method: str,
+        endpoint: str,
+        data: Dict[str, Any] | None,
+        params: Dict[str, str] | None,
+        cache_key: str | None,
+        cached: _CachedResponse | None,
+        cache_ttl: float,
+        item_factory: Callable[[Any], Any] | None,
+        priority: int,
+        revalidate: bool = False,
     ) -> Any:
-        """Make an authenticated request to the API."""
+        """Send a request, retrying GETs that failed transiently."""
+        # Actions are not idempotent, only reads are retried
+        attempts = REQUEST_RETRY_ATTEMPTS if method == "GET" else 1
+        for attempt in range(1, attempts + 1):
+            self._breaker.check()
+            try:
+                result = await self._scheduler.run(
+                    lambda: self._sendRequest(
+                        method, endpoint, data, params, cache_key, cached, cache_ttl, item_factory,
+                        revalidate,
+                    ),
+                    priority,
+                )
+            except Exception as e:
+                if not isTransientError(e):
+                    # xo-server answered, it is reachable
+                    self._breaker.recordSuccess()
+                    raise
+                self._breaker.recordFailure()
+                if attempt == attempts or self._breaker.state != "closed":
+                    raise
+                delay = random.uniform(
+                    0, min(REQUEST_RETRY_MAX_DELAY, REQUEST_RETRY_BASE_DELAY * 2 ** (attempt - 1))
+                )
+                self._retries += 1
+                _LOGGER.debug(f"Retrying {endpoint} in {delay:.2f}s after: {e}")
+                await asyncio.sleep(delay)
+            else:
+                self._breaker.recordSuccess()
+                return result
+
+    async def _sendRequest(
+        self,
+        method: str,
+        endpoint: str,
+        data: Dict[str, Any] | None,
+        params: Dict[str, str] | None,
+        cache_key: str | None = None,
+        cached: _CachedResponse | None = None,
+        cache_ttl: float = 0,
+        item_factory: Callable[[Any], Any] | None = None,
+        revalidate: bool = False,
+    ) -> Any:
+        """Send a single request once the scheduler granted a slot."""
         session = await self._ensureSession()
         url = f"{self._api_url}/{endpoint}"
 
+        headers = {}
+        if cached is not None:
+            if cached.etag:
+                headers["If-None-Match"] = cached.etag
+            if cached.lastModified:
+                headers["If-Modified-Since"] = cached.lastModified
+
+        sample = self.metrics.start(method, endpoint)
+        failed = True
         try:
             # The cookie is now part of the session, no need to pass it here.
-            async with session.request(method, url, json=data) as response:
+            async with session.request(
+                method,
+                url,
+                json=data,
+                params=params,
+                headers=headers,
+                timeout=self._requestTimeout,
+            ) as response:
                 if str(response.url).endswith("/signin"):
                     raise Exception("Authentication failed, redirected to signin page.")
 
+                if response.status == 304 and cached is not None:
+                    self._cacheStats["not_modified"] += 1
+                    cached.expires = time.monotonic() + cache_ttl
+                    failed = False
+                    return cached.body
+
                 if response.status in [200, 202]:  # 202 = Accepted (async operation)
                     if "application/json" in response.headers.get("Content-Type", ""):
-                        return await response.json()
+                        body = await self._decodeBody(response, item_factory, sample)
+                        if (
+                            cache_key is not None
+                            and (cache_ttl > 0 or revalidate)
+                            and response.status == 200
+                        ):
+                            self._cacheResponse(cache_key, response, body, cache_ttl)
+                        failed = False
+                        return body
                     else:
                         # For 202 responses, the body is often just the task path
                         text = await response.text()
+                        sample.bytes += len(text)
                         if response.status == 202:
                             _LOGGER.debug(f"Async operation started, task: {text}")
+                            failed = False
                             return {"task_id": text.strip('"/').split('/')[-1] if text else None}
                         else:
                             raise Exception(
                                 f"Unexpected content type: {response.headers.get('Content-Type')}. Response: {text}"
                             )
                 else:
+                    if response.status == 404 and cache_key is not None:
+                        # The object is gone, so is its cached body
+                        self._responseCache.pop(cache_key, None)
                     response_text = await response.text()
-                    raise Exception(
-                        f"API request failed: {response.status} - {response_text}"
+                    raise XenOrchestraAPIError(
+                        f"API request failed: {response.status} - {response_text}",
+                        status=response.status,
                     )
         except aiohttp.ClientError as e:
             _LOGGER.error(f"API request error: {e}")
             raise
+        except asyncio.TimeoutError:
+            _LOGGER.error(f"API request to {endpoint} timed out")
+            raise
+        finally:
+            self.metrics.finish(sample, error=failed)
+
+    async def _decodeBody(
+        self,
+        response: aiohttp.ClientResponse,
+        item_factory: Callable[[Any], Any] | None,
+        sample: RequestSample,
+    ) -> Any:
+        """Decode a JSON body, streaming very large arrays element by element.
+
+        Bodies of unknown length, e.g. chunked ones, are read whole.
+        """
+        length = response.content_length
+        if item_factory is None or length is None or length < STREAM_DECODE_MIN_SIZE:
+            raw = await response.read()
+            sample.bytes += len(raw)
+            if len(raw) >= EXECUTOR_DECODE_MIN_SIZE:
+                body = await asyncio.get_running_loop().run_in_executor(None, loads, raw)
+            else:
+                body = loads(raw)
+            if item_factory is not None and isinstance(body, list):
+                body = _buildItems(body, item_factory)
+            return body
+
+        parser = JsonArrayParser()
+        items = []
+        async for chunk in response.content.iter_chunked(STREAM_CHUNK_SIZE):
+            sample.bytes += len(chunk)
+            for item in parser.feed(chunk):
+                item = item_factory(item)
+                if item is not None:
+                    items.append(item)
+        document = parser.close()
+        return items if parser.isArray else document
+
+    def _cacheResponse(
+        self,
+        cache_key: str,
+        response: aiohttp.ClientResponse,
+        body: Any,
+        cache_ttl: float,
+    ) -> None:
+        """Remember a GET body for cache_ttl seconds, with its validators.
+
+        A body without a TTL is only worth keeping if it can be revalidated.
+        """
+        self._cacheStats["misses"] += 1
+        etag = response.headers.get("ETag")
+        lastModified = response.headers.get("Last-Modified")
+        if cache_ttl <= 0 and not etag and not lastModified:
+            self._responseCache.pop(cache_key, None)
+            return
+        self._responseCache[cache_key] = _CachedResponse(
+            body=body,
+            etag=etag,
+            lastModified=lastModified,
+            expires=time.monotonic() + cache_ttl,
+        )
 
-    async def _fetch_details(self, paths: List[str]) -> List[Dict[str, Any]]:
-        """Fetch full details for a list of API paths concurrently."""
+    async def _fetch_details(
+        self,
+        paths: List[str],
+        cache_ttl: float = 0,
+        item_factory: Callable[[Any], Any] | None = None,
+    ) -> List[Any]:
+        """Fetch full details for a list of API paths through the scheduler.
+
+        Objects are passed through item_factory; when one is given, an
+        object whose fetch fails is replaced by the last model built for it.
+        """
         if not paths:
             _LOGGER.debug("No paths provided to _fetch_details")
             return []
@@ -88,45 +441,138 @@ class XenOrchestraAPI:
             endpoint = path.lstrip("/")
             _LOGGER.debug(f"Fetching detail for endpoint: {endpoint}")
             try:
-                result = await self._makeRequest("GET", endpoint)
+                result = await self._makeRequest("GET", endpoint, cache_ttl=cache_ttl)
                 _LOGGER.debug(f"Successfully fetched detail for {endpoint}")
+                if item_factory is None:
+                    return result
+                result = item_factory(result)
+                if result is not None:
+                    self._lastKnownDetails[endpoint] = result
                 return result
             except Exception as e:
+                previous = self._lastKnownDetails.get(endpoint) if item_factory else None
+                if previous is not None:
+                    # Keep the object rather than dropping it from the inventory
+                    _LOGGER.warning(f"Failed to fetch detail for {endpoint}, using last known: {e}")
+                    return previous
                 _LOGGER.error(f"Failed to fetch detail for {endpoint}: {e}")
                 return None
 
         tasks = [_get_detail(path) for path in paths]
         results = await asyncio.gather(*tasks, return_exceptions=True)
 
+        # Forget objects that left the collections just listed
+        listed = {path.lstrip("/") for path in paths}
+        collections = {endpoint.rsplit("/", 1)[0] for endpoint in listed}
+        for endpoint in list(self._lastKnownDetails):
+            if endpoint not in listed and endpoint.rsplit("/", 1)[0] in collections:
+                del self._lastKnownDetails[endpoint]
+        for endpoint in list(self._responseCache):
+            if endpoint not in listed and endpoint.rsplit("/", 1)[0] in collections:
+                del self._responseCache[endpoint]
+
         # Filter out any exceptions that may have occurred
         valid_results = [res for res in results if res is not None and not isinstance(res, Exception)]
         _LOGGER.debug(f"_fetch_details returning {len(valid_results)} valid results out of {len(results)} total")
         return valid_results
 
-    async def getVMs(self) -> List[Dict[str, Any]]:
+    async def _getCollection(
+        self,
+        endpoint: str,
+        fields: tuple[str, ...] | None = None,
+        cache_ttl: float = 0,
+        item_factory: Callable[[Any], Any] | None = None,
+    ) -> List[Any]:
+        """Get every object of a collection, projected when supported.
+
+        Objects are returned through item_factory when given; path strings
+        of non-projected listings are passed through untouched.
+        """
+        if self._supportsProjection is False:
+            paths = await self._makeRequest("GET", endpoint)
+            return await self._fetch_details(paths, cache_ttl, item_factory)
+
+        params = {"fields": ",".join(fields or self._fields[endpoint])}
+        try:
+            # Listings are revalidated on every call, an unchanged one is a 304
+            items = await self._makeRequest(
+                "GET",
+                endpoint,
+                params=params,
+                cache_ttl=cache_ttl,
+                item_factory=item_factory,
+                revalidate=True,
+            )
+        except Exception as e:
+            if self._supportsProjection or not _isRejection(e):
+                # Timeouts, overload and auth errors say nothing about projection
+                raise
+            # Some xo-server versions reject unknown query parameters outright;
+            # if the plain listing works, projection is simply not available.
+            _LOGGER.debug(f"Projected listing of {endpoint} failed ({e}), retrying without fields")
+            items = await self._makeRequest("GET", endpoint)
+            if items and all(isinstance(item, str) for item in items):
+                self._setProjectionSupport(False)
+            return await self._fetch_details(items, cache_ttl, item_factory)
+
+        if not items:
+            return []
+
+        paths = [item for item in items if isinstance(item, str)]
+        if not paths:
+            self._setProjectionSupport(True)
+            return items
+
+        # The fields parameter was ignored and we got the list of paths back
+        self._setProjectionSupport(False)
+        return await self._fetch_details(paths, cache_ttl, item_factory)
+
+    def _setProjectionSupport(self, supported: bool) -> None:
+        """Record whether field projection is available, logging the first detection."""
+        if self._supportsProjection is None:
+            if supported:
+                _LOGGER.info("Xen Orchestra supports field projection, using bulk collection requests")
+            else:
+                _LOGGER.info("Xen Orchestra does not support field projection, fetching objects individually")
+        self._supportsProjection = supported
+
+    async def getVMs(self) -> List[VMState]:
         """Get all virtual machines with their details."""
         _LOGGER.debug("Starting getVMs request")
-        vm_paths = await self._makeRequest("GET", "rest/v0/vms")
-        _LOGGER.debug(f"getVMs returned {len(vm_paths)} VM paths")
-        result = await self._fetch_details(vm_paths)
+        result = await self._getCollection(
+            API_ENDPOINT_VMS, item_factory=_modelFactory(VMState)
+        )
         _LOGGER.debug(f"getVMs returning {len(result)} VM objects")
         return result
 
-    async def getHosts(self) -> List[Dict[str, Any]]:
+    async def getVMPowerStates(self) -> Dict[str, str | None]:
+        """Get the power state of every VM, keyed by VM UUID."""
+        _LOGGER.debug("Starting getVMPowerStates request")
+        result = {
+            item["uuid"]: item.get("power_state")
+            for item in await self._getCollection(
+                API_ENDPOINT_VMS, ("uuid", "power_state")
+            )
+            if item.get("uuid")
+        }
+        _LOGGER.debug(f"getVMPowerStates returning {len(result)} VM states")
+        return result
+
+    async def getHosts(self) -> List[HostState]:
         """Get all hosts with their details."""
         _LOGGER.debug("Starting getHosts request")
-        host_paths = await self._makeRequest("GET", "rest/v0/hosts")
-        _LOGGER.debug(f"getHosts returned {len(host_paths)} host paths")
-        result = await self._fetch_details(host_paths)
+        result = await self._getCollection(
+            API_ENDPOINT_HOSTS, cache_ttl=HOST_CACHE_TTL, item_factory=_modelFactory(HostState)
+        )
         _LOGGER.debug(f"getHosts returning {len(result)} host objects")
         return result
 
-    async def getPools(self) -> List[Dict[str, Any]]:
+    async def getPools(self) -> List[PoolState]:
         """Get all pools with their details."""
         _LOGGER.debug("Starting getPools request")
-        pool_paths = await self._makeRequest("GET", "rest/v0/pools")
-        _LOGGER.debug(f"getPools returned {len(pool_paths)} pool paths")
-        result = await self._fetch_details(pool_paths)
+        result = await self._getCollection(
+            API_ENDPOINT_POOLS, cache_ttl=POOL_CACHE_TTL, item_factory=_modelFactory(PoolState)
+        )
         _LOGGER.debug(f"getPools returning {len(result)} pool objects")
         return result
 
@@ -134,39 +580,85 @@ class XenOrchestraAPI:
         """Get host statistics."""
         try:
             _LOGGER.debug(f"Getting stats for host {host_id}")
-            stats = await self._makeRequest("GET", f"rest/v0/hosts/{host_id}/stats")
+            stats = await self._makeRequest(
+                "GET",
+                f"rest/v0/hosts/{host_id}/stats",
+                params={"granularity": STATS_GRANULARITY},
+            )
             _LOGGER.debug(f"Host stats retrieved for {host_id}")
-            return stats
+            return _compactStats(stats, self._statsWindow)
         except Exception as e:
             _LOGGER.error(f"Failed to get host stats for {host_id}: {e}")
             return {}
 
-    async def startVM(self, vm_id: str) -> None:
-        """Start a VM."""
+    async def getVMStats(self, vm_id: str) -> Dict[str, Any]:
+        """Get VM statistics."""
         try:
-            response = await self._makeRequest("POST", f"rest/v0/vms/{vm_id}/actions/start")
-            _LOGGER.debug(f"Started VM {vm_id}")
+            _LOGGER.debug(f"Getting stats for VM {vm_id}")
+            stats = await self._makeRequest(
+                "GET",
+                f"rest/v0/vms/{vm_id}/stats",
+                params={"granularity": STATS_GRANULARITY},
+            )
+            _LOGGER.debug(f"VM stats retrieved for {vm_id}")
+            return _compactStats(stats, self._statsWindow)
         except Exception as e:
-            _LOGGER.error(f"Failed to start VM {vm_id}: {e}")
-            raise
+            _LOGGER.error(f"Failed to get VM stats for {vm_id}: {e}")
+            return {}
 
-    async def stopVM(self, vm_id: str) -> None:
-        """Stop a VM."""
+    async def vmAction(self, vm_id: str, action: str) -> str | None:
+        """Run a VM action and return the ID of the task xo-server started."""
         try:
-            response = await self._makeRequest("POST", f"rest/v0/vms/{vm_id}/actions/clean_shutdown")
-            _LOGGER.debug(f"Stopped VM {vm_id}")
+            response = await self._makeRequest("POST", f"rest/v0/vms/{vm_id}/actions/{action}")
+            _LOGGER.debug(f"Requested {action} of VM {vm_id}")
         except Exception as e:
-            _LOGGER.error(f"Failed to stop VM {vm_id}: {e}")
+            _LOGGER.error(f"Failed to {action} VM {vm_id}: {e}")
             raise
+        if isinstance(response, dict):
+            return response.get("task_id")
+        return None
 
-    async def hardShutdownVM(self, vm_id: str) -> None:
-        """Hard shutdown a VM."""
+    async def _getObject(self, endpoint: str, object_id: str, model: Any) -> Any:
+        """Get a single object as a model, or None if it does not exist."""
         try:
-            response = await self._makeRequest("POST", f"rest/v0/vms/{vm_id}/actions/hard_shutdown")
-            _LOGGER.debug(f"Hard shutdown VM {vm_id}")
-        except Exception as e:
-            _LOGGER.error(f"Failed to hard shutdown VM {vm_id}: {e}")
+            # Targeted refreshes follow user actions, do not queue them
+            item = await self._makeRequest(
+                "GET", f"{endpoint}/{object_id}", priority=PRIORITY_INTERACTIVE
+            )
+        except XenOrchestraAPIError as e:
+            if e.status == 404:
+                return None
             raise
+        if not isinstance(item, dict) or not item.get("uuid"):
+            # Only a 404 means the object is gone
+            raise XenOrchestraAPIError(f"Unexpected response for {endpoint}/{object_id}")
+        return model.from_dict(item)
+
+    async def getVM(self, vm_id: str) -> VMState | None:
+        """Get a single virtual machine, or None if it does not exist."""
+        return await self._getObject(API_ENDPOINT_VMS, vm_id, VMState)
+
+    async def getHost(self, host_id: str) -> HostState | None:
+        """Get a single host, or None if it does not exist."""
+        return await self._getObject(API_ENDPOINT_HOSTS, host_id, HostState)
+
+    async def getTask(self, task_id: str) -> Dict[str, Any]:
+        """Get the state of an asynchronous task."""
+        return await self._makeRequest(
+            "GET", f"{API_ENDPOINT_TASKS}/{task_id}", priority=PRIORITY_INTERACTIVE
+        )
+
+    async def startVM(self, vm_id: str) -> str | None:
+        """Start a VM and return the ID of the started task."""
+        return await self.vmAction(vm_id, "start")
+
+    async def stopVM(self, vm_id: str) -> str | None:
+        """Stop a VM and return the ID of the started task."""
+        return await self.vmAction(vm_id, "clean_shutdown")
+
+    async def hardShutdownVM(self, vm_id: str) -> str | None:
+        """Hard shutdown a VM and return the ID of the started task."""
+        return await self.vmAction(vm_id, "hard_shutdown")
 
     async def restartVM(self, vm_id: str) -> bool:
         """Restart a virtual machine."""
@@ -223,7 +715,99 @@ class XenOrchestraAPI:
             _LOGGER.error(f"Failed to disable host {host_id}: {e}")
             return False
 
+    def getDiagnostics(self) -> Dict[str, Any]:
+        """Return client state for diagnostics."""
+        return {
+            "supports_projection": self._supportsProjection,
+            "json_decoder": DECODER,
+            "response_cache": {"entries": len(self._responseCache), **self._cacheStats},
+            "scheduler": self._scheduler.getDiagnostics(),
+            "circuit_breaker": self._breaker.getDiagnostics(),
+            "retries": self._retries,
+            "coalesced_requests": self._coalescedGets,
+            "in_flight_gets": len(self._inFlightGets),
+            "last_known_details": len(self._lastKnownDetails),
+            "requests": self.metrics.getDiagnostics(),
+            "connection_pool": getConnectorDiagnostics(self._api_url, self._ssl_verify),
+        }
+
     async def close(self) -> None:
-        """Close the API session."""
+        """Close the API session and release the shared connection pool."""
         if self._session and not self._session.closed:
-            await self._session.close()
\ No newline at end of file
+            await self._session.close()
+        if self._connectorAcquired:
+            self._connectorAcquired = False
+            await releaseConnector(self._api_url, self._ssl_verify)
+
+
+def isTransientError(error: BaseException) -> bool:
+    """Return True for failures expected to pass: timeouts, connection errors, overload."""
+    if isinstance(error, CircuitOpenError):
+        return True
+    if isinstance(error, XenOrchestraAPIError):
+        return error.isOverload
+    return isinstance(error, (asyncio.TimeoutError, aiohttp.ClientError))
+
+
+def _isRejection(error: BaseException) -> bool:
+    """Return True when xo-server refused the request itself, e.g. an unknown parameter."""
+    return (
+        isinstance(error, XenOrchestraAPIError)
+        and not isTransientError(error)
+        and error.status is not None
+        and 400 <= error.status < 500
+        and error.status not in (401, 403)
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def _modelFactory(model: Any) -> Callable[[Any], Any]:
+    """Return an item factory building a model from each decoded object.
+
+    The factory of a model is always the same object, so concurrent GETs of
+    a collection share one in-flight request.
+    """
+
+    def build(item: Any) -> Any:
+        if not isinstance(item, dict):
+            return item
+        return model.from_dict(item) if item.get("uuid") else None
+
+    return build
+
+
+def _buildItems(items: List[Any], item_factory: Callable[[Any], Any] | None) -> List[Any]:
+    """Pass decoded items through an item factory, dropping None results."""
+    if item_factory is None:
+        return items
+    return [
+        built for built in (item_factory(item) for item in items) if built is not None
+    ]
+
+
+def _cacheKey(endpoint: str, params: Dict[str, str] | None) -> str:
+    """Build the response cache key for a GET request."""
+    if not params:
+        return endpoint
+    query = "&".join(f"{key}={value}" for key, value in sorted(params.items()))
+    return f"{endpoint}?{query}"
+
+
+def _compactStats(value: Any, window: int) -> Any:
+    """Trim every RRD series in a stats payload to its latest samples.
+
+    Trailing gaps (null samples) are skipped so the last element of each
+    series is always the most recent real value.
+    """
+    if isinstance(value, dict):
+        return {key: _compactStats(item, window) for key, item in value.items()}
+    if isinstance(value, list):
+        samples = []
+        for sample in reversed(value):
+            if sample is not None:
+                samples.append(sample)
+                if len(samples) == window:
+                    break
+        samples.reverse()
+        return samples
+    return value
@@ -9,11 +9,12 @@ from homeassistant.components.binary_sensor import (
     BinarySensorEntityDescription,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from .const import DOMAIN, VM_STATE_RUNNING
 from .entity import XenOrchestraBaseEntity
+from .models import VMState
 
 if TYPE_CHECKING:
     from . import XenOrchestraDataUpdateCoordinator
@@ -38,15 +39,16 @@ async def async_setup_entry(
         entry.entry_id
     ]["coordinator"]
 
-    entities = []
-    if coordinator.data:
-        for vm_data in coordinator.data.get("vms", []):
-            for description in BINARY_SENSORS:
-                entities.append(
-                    XenOrchestraVMRunningSensor(coordinator, vm_data, description)
-                )
+    @callback
+    def _async_add_vms(vms: list[VMState]) -> None:
+        async_add_entities(
+            XenOrchestraVMRunningSensor(coordinator, vm, description)
+            for vm in vms
+            for description in BINARY_SENSORS
+        )
 
-    async_add_entities(entities)
+    # Called now for the known VMs and again whenever new VMs appear
+    entry.async_on_unload(coordinator.async_add_object_listener("vms", _async_add_vms))
 
 
 class XenOrchestraVMRunningSensor(XenOrchestraBaseEntity, BinarySensorEntity):
@@ -55,23 +57,15 @@ class XenOrchestraVMRunningSensor(XenOrchestraBaseEntity, BinarySensorEntity):
     def __init__(
         self,
         coordinator: "XenOrchestraDataUpdateCoordinator",
-        vm_data: dict,
+        vm: VMState,
         description: BinarySensorEntityDescription,
     ) -> None:
         """Initialize the binary sensor."""
         self.entity_description = description
-        super().__init__(coordinator, vm_data)
+        super().__init__(coordinator, vm)
 
     @property
     def is_on(self) -> bool:
         """Return the state of the sensor."""
-        vm_uuid = self._vm_data["uuid"]
-        vm_info = next(
-            (
-                vm
-                for vm in self.coordinator.data.get("vms", [])
-                if vm["uuid"] == vm_uuid
-            ),
-            None,
-        )
-        return vm_info.get("power_state") == VM_STATE_RUNNING if vm_info else False
\ No newline at end of file
+        vm_info = self._get_current_vm_data()
+        return vm_info.power_state == VM_STATE_RUNNING if vm_info else False
\ No newline at end of file
@@ -6,11 +6,12 @@ from typing import TYPE_CHECKING
 
 from homeassistant.components.button import ButtonEntity, ButtonEntityDescription
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from .const import DOMAIN, ICON_VM_HARD_SHUTDOWN
 from .entity import XenOrchestraBaseEntity
+from .models import VMState
 
 if TYPE_CHECKING:
     from . import XenOrchestraDataUpdateCoordinator
@@ -36,26 +37,18 @@ async def async_setup_entry(
         entry.entry_id
     ]["coordinator"]
 
-    entities = []
-    _LOGGER.debug(f"Button platform setup - Coordinator data: {coordinator.data}")
-    
-    if coordinator.data:
-        vms = coordinator.data.get("vms", [])
-        _LOGGER.debug(f"Button platform setup - Found {len(vms)} VMs")
-        
-        # Create VM action buttons
-        for vm_data in vms:
-            _LOGGER.debug(f"Creating buttons for VM: {vm_data.get('name_label', 'Unknown')} ({vm_data.get('uuid', 'No UUID')})")
-            for description in VM_BUTTONS:
-                entities.append(
-                    XenOrchestraVMActionButton(coordinator, vm_data, description)
-                )
-    else:
-        _LOGGER.warning("Button platform setup - No coordinator data available")
+    @callback
+    def _async_add_vms(vms: list[VMState]) -> None:
+        _LOGGER.debug(f"Adding buttons for {len(vms)} VMs")
+        async_add_entities(
+            XenOrchestraVMActionButton(coordinator, vm, description)
+            for vm in vms
+            for description in VM_BUTTONS
+        )
 
     # Note: Host power management actions are not available in XOA REST API v0
-    _LOGGER.info(f"Adding {len(entities)} VM button entities")
-    async_add_entities(entities)
+    # Called now for the known VMs and again whenever new VMs appear
+    entry.async_on_unload(coordinator.async_add_object_listener("vms", _async_add_vms))
 
 
 class XenOrchestraVMActionButton(XenOrchestraBaseEntity, ButtonEntity):
@@ -64,21 +57,19 @@ class XenOrchestraVMActionButton(XenOrchestraBaseEntity, ButtonEntity):
     def __init__(
         self,
         coordinator: "XenOrchestraDataUpdateCoordinator",
-        vm_data: dict,
+        vm: VMState,
         description: ButtonEntityDescription,
     ) -> None:
         """Initialize the button."""
         self.entity_description = description
-        self._vm_data = vm_data
-        super().__init__(coordinator, vm_data)
+        super().__init__(coordinator, vm)
 
     async def async_press(self) -> None:
         """Handle the button press."""
         api = self.coordinator.api
-        vm_id = self._vm_data["uuid"]
+        vm_id = self._vm_uuid
         
         if self.entity_description.key == "hard_shutdown":
-            await api.hardShutdownVM(vm_id)
-        
-        # Request a coordinator refresh to update states
-        await self.coordinator.async_request_refresh()
\ No newline at end of file
+            task_id = await api.hardShutdownVM(vm_id)
+            # Refresh the VM once xo-server finished the shutdown
+            self.coordinator.async_track_action(vm_id, "hard_shutdown", task_id)
\ No newline at end of file
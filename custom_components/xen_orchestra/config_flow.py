@@ -6,13 +6,29 @@ from typing import Any
 
 import voluptuous as vol
 from homeassistant import config_entries
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.data_entry_flow import FlowResult
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
 from .api import XenOrchestraAPI
-from .const import CONF_API_TOKEN, CONF_API_URL, CONF_SSL_VERIFY, DOMAIN
+from .const import (
+    CONF_API_TOKEN,
+    CONF_API_URL,
+    CONF_INVENTORY_INTERVAL,
+    CONF_POWER_INTERVAL,
+    CONF_PUSH_UPDATES,
+    CONF_SSL_VERIFY,
+    CONF_STATS_INTERVAL,
+    DEFAULT_INVENTORY_INTERVAL,
+    DEFAULT_POWER_INTERVAL,
+    DEFAULT_PUSH_UPDATES,
+    DEFAULT_STATS_INTERVAL,
+    DOMAIN,
+    MIN_INVENTORY_INTERVAL,
+    MIN_POWER_INTERVAL,
+    MIN_STATS_INTERVAL,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -68,6 +84,54 @@ class XenOrchestraConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             step_id="user", data_schema=STEP_USER_DATA_SCHEMA, errors=errors
         )
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,
+    ) -> XenOrchestraOptionsFlow:
+        """Get the options flow for this handler."""
+        return XenOrchestraOptionsFlow(config_entry)
+
+
+class XenOrchestraOptionsFlow(config_entries.OptionsFlow):
+    """Handle the refresh options for Xen Orchestra."""
+
+    def __init__(self, config_entry: config_entries.ConfigEntry) -> None:
+        """Initialize the options flow."""
+        self._config_entry = config_entry
+
+    async def async_step_init(
+        self, userInput: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Manage the refresh intervals and event updates."""
+        if userInput is not None:
+            return self.async_create_entry(title="", data=userInput)
+
+        options = self._config_entry.options
+        schema = vol.Schema(
+            {
+                vol.Optional(
+                    CONF_PUSH_UPDATES,
+                    default=options.get(CONF_PUSH_UPDATES, DEFAULT_PUSH_UPDATES),
+                ): bool,
+                vol.Optional(
+                    CONF_POWER_INTERVAL,
+                    default=options.get(CONF_POWER_INTERVAL, DEFAULT_POWER_INTERVAL),
+                ): vol.All(vol.Coerce(int), vol.Range(min=MIN_POWER_INTERVAL)),
+                vol.Optional(
+                    CONF_STATS_INTERVAL,
+                    default=options.get(CONF_STATS_INTERVAL, DEFAULT_STATS_INTERVAL),
+                ): vol.All(vol.Coerce(int), vol.Range(min=MIN_STATS_INTERVAL)),
+                vol.Optional(
+                    CONF_INVENTORY_INTERVAL,
+                    default=options.get(
+                        CONF_INVENTORY_INTERVAL, DEFAULT_INVENTORY_INTERVAL
+                    ),
+                ): vol.All(vol.Coerce(int), vol.Range(min=MIN_INVENTORY_INTERVAL)),
+            }
+        )
+        return self.async_show_form(step_id="init", data_schema=schema)
+
 
 class CannotConnect(HomeAssistantError):
     """Error to indicate we cannot connect."""
\ No newline at end of file
@@ -0,0 +1,95 @@
+"""Shared HTTP connection pools for Xen Orchestra API clients."""
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from typing import Any, Dict
+from urllib.parse import urlsplit
+
+import aiohttp
+
+from .const import (
+    CONNECTION_DNS_CACHE_TTL,
+    CONNECTION_KEEPALIVE_TIMEOUT,
+    CONNECTION_LIMIT,
+    CONNECTION_LIMIT_PER_HOST,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass
+class _SharedConnector:
+    """A connector and the number of API clients using it."""
+
+    connector: aiohttp.TCPConnector
+    clients: int = 0
+
+
+# One pool per XO host and SSL setting, shared by every config entry,
+# config flow validation and API client that talks to it.
+_CONNECTORS: Dict[tuple[str, bool], _SharedConnector] = {}
+
+
+def _poolKey(api_url: str, ssl_verify: bool) -> tuple[str, bool]:
+    """Return the key of the pool serving an API URL."""
+    parts = urlsplit(api_url)
+    return (f"{parts.scheme}://{parts.netloc}".lower(), ssl_verify)
+
+
+def acquireConnector(api_url: str, ssl_verify: bool) -> aiohttp.TCPConnector:
+    """Return the shared connector for an XO host, creating it if needed.
+
+    Every call must be balanced by releaseConnector().
+    """
+    key = _poolKey(api_url, ssl_verify)
+    shared = _CONNECTORS.get(key)
+    if shared is None or shared.connector.closed:
+        _LOGGER.debug(f"Creating connection pool for {key[0]}")
+        shared = _SharedConnector(
+            connector=aiohttp.TCPConnector(
+                # aiohttp keeps one SSL context per verification mode, so
+                # every connection of the pool shares it
+                ssl=ssl_verify,
+                limit=CONNECTION_LIMIT,
+                limit_per_host=CONNECTION_LIMIT_PER_HOST,
+                keepalive_timeout=CONNECTION_KEEPALIVE_TIMEOUT,
+                ttl_dns_cache=CONNECTION_DNS_CACHE_TTL,
+                use_dns_cache=True,
+            )
+        )
+        _CONNECTORS[key] = shared
+    shared.clients += 1
+    return shared.connector
+
+
+async def releaseConnector(api_url: str, ssl_verify: bool) -> None:
+    """Release a connector, closing it once no client uses it anymore."""
+    key = _poolKey(api_url, ssl_verify)
+    shared = _CONNECTORS.get(key)
+    if shared is None:
+        return
+    shared.clients -= 1
+    if shared.clients <= 0:
+        _CONNECTORS.pop(key, None)
+        _LOGGER.debug(f"Closing connection pool for {key[0]}")
+        await shared.connector.close()
+
+
+def getConnectorDiagnostics(api_url: str, ssl_verify: bool) -> Dict[str, Any]:
+    """Return usage statistics of the pool serving an API URL."""
+    shared = _CONNECTORS.get(_poolKey(api_url, ssl_verify))
+    if shared is None:
+        return {"active": False}
+    connector = shared.connector
+    # aiohttp does not expose pool usage publicly, read it defensively
+    idle = getattr(connector, "_conns", {})
+    acquired = getattr(connector, "_acquired", set())
+    return {
+        "active": not connector.closed,
+        "clients": shared.clients,
+        "limit": connector.limit,
+        "limit_per_host": connector.limit_per_host,
+        "in_use": len(acquired),
+        "idle": sum(len(connections) for connections in idle.values()),
+    }
@@ -6,6 +6,76 @@ DOMAIN = "xen_orchestra"
 API_ENDPOINT_VMS = "rest/v0/vms"
 API_ENDPOINT_HOSTS = "rest/v0/hosts"
 API_ENDPOINT_POOLS = "rest/v0/pools"
+API_ENDPOINT_TASKS = "rest/v0/tasks"
+
+# Fields requested through the REST collection projection (?fields=...).
+# These cover everything the entity platforms and the coordinator read.
+VM_FIELDS = ("uuid", "name_label", "power_state", "tags", "$container", "$pool")
+HOST_FIELDS = ("uuid", "name_label", "power_state", "enabled", "$pool")
+POOL_FIELDS = ("uuid", "name_label", "master")
+
+# Stats requests: the finest RRD granularity, trimmed to the latest samples
+STATS_GRANULARITY = "seconds"
+DEFAULT_STATS_WINDOW = 1
+
+# Inventory snapshot persisted for instant startup
+STORAGE_VERSION = 1
+STORAGE_KEY = f"{DOMAIN}.inventory"
+STORAGE_SAVE_DELAY = 60
+
+# Seconds a response for rarely changing objects is reused without a request
+POOL_CACHE_TTL = 600
+HOST_CACHE_TTL = 120
+
+# Request scheduling
+DEFAULT_REQUEST_TIMEOUT = 15
+DEFAULT_MAX_CONCURRENCY = 16
+# Request slots added to the adaptive limit for actions and targeted refreshes
+INTERACTIVE_RESERVED_SLOTS = 2
+
+# Deadlines for the concurrent fetches of a coordinator refresh
+INVENTORY_FETCH_TIMEOUT = 60
+HOST_STATS_FETCH_TIMEOUT = 10
+VM_STATS_FETCH_TIMEOUT = 10
+
+# Full refreshes requested within this many seconds run as a single cycle
+REQUEST_REFRESH_COOLDOWN = 2
+# Targeted VM and host refreshes requested within this many seconds are
+# fetched together
+TARGETED_REFRESH_WINDOW = 0.5
+# VM stats are fetched in sweeps of this many VMs
+VM_STATS_BATCH_SIZE = 10
+
+# Retries of idempotent GET requests, with full-jitter exponential backoff
+REQUEST_RETRY_ATTEMPTS = 3
+REQUEST_RETRY_BASE_DELAY = 0.5
+REQUEST_RETRY_MAX_DELAY = 8
+# Consecutive transient failures that pause requests, and for how long (s)
+CIRCUIT_FAILURE_THRESHOLD = 5
+CIRCUIT_RESET_TIMEOUT = 30
+# Seconds the last successful refresh is kept, marked stale, while
+# refreshes fail transiently, before entities become unavailable
+STALE_DATA_MAX_AGE = 900
+
+# JSON array responses announcing a length above this are decoded
+# incrementally while they are received, bounding peak memory; the
+# incremental parser is several times slower than decoding a whole body
+STREAM_DECODE_MIN_SIZE = 8 * 2**20
+STREAM_CHUNK_SIZE = 64 * 1024
+# Whole bodies larger than this are decoded in the executor so decoding
+# does not stall the event loop
+EXECUTOR_DECODE_MIN_SIZE = 2**20
+
+# Seconds an object must stay missing before its device, and with it the
+# entity customisations, is removed; xo-server also drops every object of
+# a pool while it reconnects to that pool
+DEVICE_PRUNE_GRACE_PERIOD = 3600
+
+# Shared connection pool per XO host
+CONNECTION_LIMIT = 32
+CONNECTION_LIMIT_PER_HOST = 20
+CONNECTION_KEEPALIVE_TIMEOUT = 60
+CONNECTION_DNS_CACHE_TTL = 300
 
 # VM States
 VM_STATE_RUNNING = "Running"
@@ -29,6 +99,32 @@ ACTION_SUSPEND_VM = "suspend"
 ACTION_ENABLE_HOST = "enable"
 ACTION_DISABLE_HOST = "disable"
 
+# VM actions of the REST API accepted by the bulk_vm_action service
+BULK_VM_ACTIONS = (
+    "start",
+    "clean_shutdown",
+    "hard_shutdown",
+    "clean_reboot",
+    "hard_reboot",
+    "pause",
+    "unpause",
+    "suspend",
+    "resume",
+)
+DEFAULT_BULK_CONCURRENCY = 5
+MAX_BULK_CONCURRENCY = 20
+
+# Services and events
+SERVICE_BULK_VM_ACTION = "bulk_vm_action"
+EVENT_BULK_VM_ACTION = f"{DOMAIN}_bulk_vm_action"
+EVENT_TASK = f"{DOMAIN}_task"
+EVENT_ACTION_FAILED = f"{DOMAIN}_action_failed"
+
+# Polling of the tasks started by VM actions, in seconds
+TASK_POLL_MIN_DELAY = 0.5
+TASK_POLL_MAX_DELAY = 10
+TASK_TIMEOUT = 600
+
 # Icons
 ICON_VM_RUNNING = "mdi:server"
 ICON_VM_STOPPED = "mdi:server-off"
@@ -44,6 +140,11 @@ ICON_HOST_ENABLED = "mdi:server-network"
 ICON_HOST_DISABLED = "mdi:server-network-off"
 ICON_HOST_MAINTENANCE = "mdi:wrench"
 
+ICON_VM_CPU = "mdi:cpu-64-bit"
+ICON_VM_MEMORY = "mdi:memory"
+ICON_VM_DISK = "mdi:harddisk"
+ICON_VM_NETWORK = "mdi:network"
+
 ICON_POOL = "mdi:server-network-outline"
 ICON_INTEGRATION = "mdi:application-outline"
 ACTION_REBOOT_HOST = "reboot"
@@ -56,6 +157,22 @@ ACTION_EXIT_MAINTENANCE = "exitMaintenance"
 CONF_API_URL = "api_url"
 CONF_API_TOKEN = "api_token"
 CONF_SSL_VERIFY = "ssl_verify"
+CONF_PUSH_UPDATES = "push_updates"
+CONF_POWER_INTERVAL = "power_interval"
+CONF_STATS_INTERVAL = "stats_interval"
+CONF_INVENTORY_INTERVAL = "inventory_interval"
+
+DEFAULT_PUSH_UPDATES = True
+# Refresh tiers, in seconds
+DEFAULT_POWER_INTERVAL = 30
+DEFAULT_STATS_INTERVAL = 30
+DEFAULT_INVENTORY_INTERVAL = 300
+MIN_POWER_INTERVAL = 5
+MIN_STATS_INTERVAL = 10
+MIN_INVENTORY_INTERVAL = 60
+# Seconds a tier may be checked before it is due: the coordinator timer
+# fires on whole seconds, up to one second early
+REFRESH_TIER_TOLERANCE = 1
 
 # Attributes
 ATTR_VM_ID = "vm_id"
@@ -66,4 +183,16 @@ ATTR_CPU_USAGE = "cpu_usage"
 ATTR_POWER_STATE = "power_state"
 ATTR_TOOLS_VERSION = "tools_version"
 ATTR_IP_ADDRESS = "ip_address"
-ATTR_UPTIME = "uptime"
\ No newline at end of file
+ATTR_UPTIME = "uptime"
+ATTR_ACTION = "action"
+ATTR_VMS = "vms"
+ATTR_TAGS = "tags"
+ATTR_POOL = "pool"
+ATTR_MAX_CONCURRENCY = "max_concurrency"
+ATTR_TASKS = "tasks"
+ATTR_FAILED = "failed"
+ATTR_TRANSITION = "transition"
+
+# Optimistic power switch transitions
+TRANSITION_STARTING = "starting"
+TRANSITION_STOPPING = "stopping"
\ No newline at end of file
@@ -0,0 +1,116 @@
+"""JSON decoding helpers for Xen Orchestra API responses."""
+from __future__ import annotations
+
+import json
+import re
+from typing import Any, List
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
+# Name of the decoder in use, reported in diagnostics
+DECODER = "orjson" if orjson is not None else "json"
+
+_STRUCTURAL = re.compile(rb'[\[\]{}",\\]')
+_OPEN = frozenset(b"[{")
+_CLOSE = frozenset(b"]}")
+_QUOTE = ord('"')
+_COMMA = ord(",")
+_BACKSLASH = ord("\\")
+_WHITESPACE = b" \t\r\n"
+
+
+def loads(data: bytes | str) -> Any:
+    """Decode a JSON document with the fastest available decoder."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+class JsonArrayParser:
+    """Split a JSON array into its elements while it is being received.
+
+    Chunks are scanned for the structural characters only, and each
+    top-level element is decoded as soon as its closing delimiter arrives,
+    so only the element being received stays buffered. A document that is
+    not an array is buffered whole and decoded by close().
+    """
+
+    def __init__(self) -> None:
+        """Initialize the parser."""
+        self._buffer = bytearray()
+        # Position up to which the buffer has been scanned
+        self._pos = 0
+        # Position of the first byte that is not escaped inside a string
+        self._skip = 0
+        self._depth = 0
+        self._inString = False
+        # Start of the element being received, relative to the buffer
+        self._start = 0
+        self._isArray: bool | None = None
+        self._complete = False
+
+    @property
+    def isArray(self) -> bool:
+        """Return True when the document is a JSON array."""
+        return bool(self._isArray)
+
+    def feed(self, chunk: bytes) -> List[Any]:
+        """Add received bytes and return the elements completed by them."""
+        self._buffer += chunk
+        if self._isArray is None:
+            stripped = self._buffer.lstrip(_WHITESPACE)
+            if not stripped:
+                return []
+            self._isArray = stripped[0] == ord("[")
+        if not self._isArray or self._complete:
+            return []
+
+        buffer = self._buffer
+        items = []
+        for match in _STRUCTURAL.finditer(buffer, self._pos):
+            index = match.start()
+            if index < self._skip:
+                continue
+            char = buffer[index]
+            if self._inString:
+                if char == _BACKSLASH:
+                    self._skip = index + 2
+                elif char == _QUOTE:
+                    self._inString = False
+                continue
+
+            if char == _QUOTE:
+                self._inString = True
+            elif char in _OPEN:
+                self._depth += 1
+                if self._depth == 1:
+                    self._start = index + 1
+            elif self._depth == 1 and (char == _COMMA or char in _CLOSE):
+                element = bytes(buffer[self._start:index]).strip(_WHITESPACE)
+                if element:
+                    items.append(loads(element))
+                self._start = index + 1
+                if char in _CLOSE:
+                    self._depth = 0
+                    self._complete = True
+                    break
+            elif char in _CLOSE:
+                self._depth -= 1
+
+        # Drop everything before the element being received
+        del buffer[:self._start]
+        self._skip = max(0, self._skip - self._start)
+        self._start = 0
+        self._pos = len(buffer)
+        return items
+
+    def close(self) -> Any:
+        """Finish parsing; return the decoded document if it is not an array."""
+        if self._isArray:
+            if not self._complete:
+                raise ValueError("Truncated JSON array")
+            return None
+        return loads(bytes(self._buffer))
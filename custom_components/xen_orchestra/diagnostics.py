@@ -0,0 +1,35 @@
+"""Diagnostics support for Xen Orchestra."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import CONF_API_TOKEN, DOMAIN
+
+TO_REDACT = {CONF_API_TOKEN}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    entry_data = hass.data[DOMAIN][entry.entry_id]
+    api = entry_data["api"]
+    coordinator = entry_data["coordinator"]
+
+    data = coordinator.data or {}
+    return {
+        "entry": async_redact_data(entry.as_dict(), TO_REDACT),
+        "api": api.getDiagnostics(),
+        "coordinator": {
+            "last_update_success": coordinator.last_update_success,
+            "stale": coordinator.is_stale,
+            "vm_count": len(data.get("vms", [])),
+            "host_count": len(data.get("hosts", [])),
+            "pending_tasks": coordinator.tasks.pending,
+            "last_refresh": coordinator.refresh_metrics,
+        },
+    }
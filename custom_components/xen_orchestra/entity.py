@@ -3,10 +3,12 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
+from homeassistant.core import callback
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import DOMAIN
+from .models import VMState
 
 if TYPE_CHECKING:
     from . import XenOrchestraDataUpdateCoordinator
@@ -20,46 +22,40 @@ class XenOrchestraBaseEntity(CoordinatorEntity["XenOrchestraDataUpdateCoordinato
     def __init__(
         self,
         coordinator: "XenOrchestraDataUpdateCoordinator",
-        vm_data: dict,
+        vm: VMState,
     ) -> None:
         """Initialize the entity."""
         super().__init__(coordinator)
-        self._vm_data = vm_data
-        self._attr_unique_id = f"{self._vm_data['uuid']}_{self.entity_description.key}"
+        # Only the UUID is kept, current state is always read from the coordinator
+        self._vm_uuid = vm.uuid
+        self._attr_unique_id = f"{vm.uuid}_{self.entity_description.key}"
 
         # Link the VM entity to the host device it runs on
-        host_id = self._vm_data.get("$container")
-        via_device = (DOMAIN, host_id) if host_id else None
+        via_device = (DOMAIN, vm.container) if vm.container else None
 
         self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, self._vm_data["uuid"])},
-            name=self._vm_data["name_label"],
+            identifiers={(DOMAIN, vm.uuid)},
+            name=vm.name_label,
             manufacturer="Vates",
             model="Virtual Machine",
             via_device=via_device,
         )
 
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write state only when this VM changed in the last refresh."""
+        if self.coordinator.async_object_changed(self._vm_uuid):
+            super()._handle_coordinator_update()
+
     @property
     def available(self) -> bool:
         """Return if entity is available."""
         if not self.coordinator.last_update_success:
             return False
-            
-        # Check if the VM still exists in the coordinator data
-        vms = self.coordinator.data.get("vms", [])
-        vm_uuid = self._vm_data["uuid"]
-        
-        # Find this VM in the current data
-        current_vm = next((vm for vm in vms if vm.get("uuid") == vm_uuid), None)
-        
-        if not current_vm:
-            # VM no longer exists in XOA
-            return False
-            
-        return True
 
-    def _get_current_vm_data(self) -> dict | None:
+        # The VM no longer exists in XOA
+        return self._get_current_vm_data() is not None
+
+    def _get_current_vm_data(self) -> VMState | None:
         """Get current VM data from coordinator."""
-        vms = self.coordinator.data.get("vms", [])
-        vm_uuid = self._vm_data["uuid"]
-        return next((vm for vm in vms if vm.get("uuid") == vm_uuid), None)
\ No newline at end of file
+        return self.coordinator.get_vm(self._vm_uuid)
@@ -0,0 +1,197 @@
+"""JSON-RPC websocket client for Xen Orchestra object change events."""
+from __future__ import annotations
+
+import asyncio
+import itertools
+import json
+import logging
+import ssl
+from typing import Any, Callable, Dict, List
+
+import websockets
+
+from .decoding import loads
+
+_LOGGER = logging.getLogger(__name__)
+
+# xo-server object types mirrored into the coordinator data
+PUSH_OBJECT_TYPES = ("VM", "host", "pool")
+
+RECONNECT_MIN_DELAY = 1
+RECONNECT_MAX_DELAY = 60
+
+
+class XenOrchestraJsonRpcClient:
+    """Subscribe to xo-server object changes over its JSON-RPC websocket.
+
+    After signing in, xo-server pushes an ``all`` notification whenever
+    objects enter (are created or updated) or exit (are removed). The client
+    first loads a snapshot through ``xo.getAllObjects`` and then forwards
+    every change to the given callbacks, reconnecting with backoff when the
+    connection drops.
+    """
+
+    def __init__(
+        self,
+        api_url: str,
+        api_token: str,
+        ssl_context: ssl.SSLContext | None,
+        on_snapshot: Callable[[List[Dict[str, Any]]], None],
+        on_objects: Callable[[str, List[Dict[str, Any]]], None],
+        on_connection: Callable[[bool], None],
+    ) -> None:
+        """Initialize the client.
+
+        ssl_context is used for wss:// URLs; it is built by the caller since
+        loading the CA certificates blocks.
+        """
+        base_url = api_url.rstrip("/")
+        if base_url.startswith("https://"):
+            self._url = "wss://" + base_url[len("https://"):] + "/api/"
+        else:
+            self._url = "ws://" + base_url.split("://", 1)[-1] + "/api/"
+        self._api_token = api_token
+        self._sslContext = ssl_context if self._url.startswith("wss://") else None
+        self._onSnapshot = on_snapshot
+        self._onObjects = on_objects
+        self._onConnection = on_connection
+        self._ids = itertools.count(1)
+        self._pendingCalls: Dict[int, asyncio.Future] = {}
+        # Notifications received while the snapshot is loading, replayed after it
+        self._bufferedEvents: List[tuple[str, List[Dict[str, Any]]]] | None = None
+        self._connected = False
+        self._stopping = False
+
+    @property
+    def connected(self) -> bool:
+        """Return True while the subscription is live."""
+        return self._connected
+
+    async def run(self) -> None:
+        """Keep a subscription open, reconnecting until the task is cancelled."""
+        delay = RECONNECT_MIN_DELAY
+        while not self._stopping:
+            try:
+                async with websockets.connect(
+                    self._url, ssl=self._sslContext, max_size=None
+                ) as websocket:
+                    await self._session(websocket)
+                    delay = RECONNECT_MIN_DELAY
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                _LOGGER.warning(f"Xen Orchestra event subscription lost: {e}")
+            finally:
+                self._setConnected(False)
+
+            if self._stopping:
+                break
+            _LOGGER.debug(f"Reconnecting to Xen Orchestra events in {delay}s")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, RECONNECT_MAX_DELAY)
+
+    def stop(self) -> None:
+        """Stop reporting changes; the task running run() is cancelled next."""
+        self._stopping = True
+
+    async def _session(self, websocket: Any) -> None:
+        """Sign in, load the snapshot and process notifications."""
+        reader = asyncio.create_task(self._readMessages(websocket))
+        try:
+            await self._signIn(websocket)
+            self._bufferedEvents = []
+            objects: List[Dict[str, Any]] = []
+            for object_type in PUSH_OBJECT_TYPES:
+                result = await self._call(
+                    websocket, "xo.getAllObjects", {"filter": {"type": object_type}}
+                )
+                objects.extend(result.values() if isinstance(result, dict) else result)
+
+            self._onSnapshot(objects)
+            buffered, self._bufferedEvents = self._bufferedEvents, None
+            for event_type, items in buffered:
+                self._onObjects(event_type, items)
+
+            _LOGGER.info(f"Subscribed to Xen Orchestra events ({len(objects)} objects)")
+            self._setConnected(True)
+            await reader
+        finally:
+            self._bufferedEvents = None
+            reader.cancel()
+
+    async def _signIn(self, websocket: Any) -> None:
+        """Authenticate the websocket session with the API token."""
+        try:
+            await self._call(websocket, "session.signIn", {"token": self._api_token})
+        except JsonRpcError:
+            # xo-server versions before 5.x only know the dedicated method
+            await self._call(
+                websocket, "session.signInWithToken", {"token": self._api_token}
+            )
+
+    async def _call(self, websocket: Any, method: str, params: Dict[str, Any]) -> Any:
+        """Send a JSON-RPC request and wait for its response."""
+        request_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self._pendingCalls[request_id] = future
+        try:
+            await websocket.send(
+                json.dumps(
+                    {"jsonrpc": "2.0", "id": request_id, "method": method, "params": params}
+                )
+            )
+            return await future
+        finally:
+            self._pendingCalls.pop(request_id, None)
+
+    async def _readMessages(self, websocket: Any) -> None:
+        """Dispatch responses to pending calls and notifications to callbacks."""
+        try:
+            await self._dispatchMessages(websocket)
+        finally:
+            for future in self._pendingCalls.values():
+                if not future.done():
+                    future.set_exception(ConnectionError("Websocket closed"))
+
+    async def _dispatchMessages(self, websocket: Any) -> None:
+        """Handle every message received on the websocket."""
+        async for raw_message in websocket:
+            try:
+                message = loads(raw_message)
+            except ValueError:
+                _LOGGER.debug(f"Ignoring malformed websocket message: {raw_message[:200]}")
+                continue
+
+            if "id" in message and message.get("id") in self._pendingCalls:
+                future = self._pendingCalls[message["id"]]
+                if future.done():
+                    continue
+                if "error" in message:
+                    future.set_exception(JsonRpcError(message["error"]))
+                else:
+                    future.set_result(message.get("result"))
+            elif message.get("method") == "all":
+                params = message.get("params") or {}
+                items = [
+                    item
+                    for item in (params.get("items") or {}).values()
+                    if item.get("type") in PUSH_OBJECT_TYPES
+                ]
+                if not items:
+                    continue
+                event_type = params.get("type", "enter")
+                if self._bufferedEvents is not None:
+                    self._bufferedEvents.append((event_type, items))
+                else:
+                    self._onObjects(event_type, items)
+
+    def _setConnected(self, connected: bool) -> None:
+        """Track the connection state and report changes."""
+        if connected != self._connected:
+            self._connected = connected
+            if not self._stopping:
+                self._onConnection(connected)
+
+
+class JsonRpcError(Exception):
+    """Error returned by a JSON-RPC call."""
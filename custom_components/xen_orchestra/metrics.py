@@ -0,0 +1,133 @@
+"""Request metrics for the Xen Orchestra API client."""
+from __future__ import annotations
+
+import bisect
+import re
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Dict, List
+
+# Upper bounds, in seconds, of the latency histogram buckets
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Latencies kept per endpoint class for percentiles
+LATENCY_WINDOW = 500
+
+_API_PREFIX = re.compile(r"^/?rest/v0/")
+
+
+@dataclass
+class RequestSample:
+    """A request being measured."""
+
+    endpointClass: str
+    start: float = field(default_factory=time.monotonic)
+    bytes: int = 0
+
+
+@dataclass
+class EndpointMetrics:
+    """Counters of one endpoint class."""
+
+    requests: int = 0
+    errors: int = 0
+    bytes: int = 0
+    inFlight: int = 0
+    # One count per LATENCY_BUCKETS bound, plus one for slower requests
+    histogram: List[int] = field(default_factory=lambda: [0] * (len(LATENCY_BUCKETS) + 1))
+    recent: deque = field(default_factory=lambda: deque(maxlen=LATENCY_WINDOW))
+
+    def record(self, latency: float, size: int, error: bool) -> None:
+        """Add a finished request."""
+        self.requests += 1
+        self.bytes += size
+        if error:
+            self.errors += 1
+        self.histogram[bisect.bisect_left(LATENCY_BUCKETS, latency)] += 1
+        self.recent.append(latency)
+
+    def getDiagnostics(self) -> Dict[str, Any]:
+        """Return the counters for diagnostics."""
+        buckets = [f"<={bound}s" for bound in LATENCY_BUCKETS] + [f">{LATENCY_BUCKETS[-1]}s"]
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "bytes": self.bytes,
+            "in_flight": self.inFlight,
+            "latency_p50": _percentile(self.recent, 0.5),
+            "latency_p95": _percentile(self.recent, 0.95),
+            "latency_histogram": dict(zip(buckets, self.histogram)),
+        }
+
+
+class RequestMetrics:
+    """Latency, size, error and concurrency metrics per endpoint class.
+
+    Endpoints are grouped by shape, e.g. ``GET hosts/{id}/stats``, so the
+    per-object requests of a refresh add up to a handful of classes.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the metrics."""
+        self._endpoints: Dict[str, EndpointMetrics] = {}
+        self._requests = 0
+        self._recent: deque = deque(maxlen=LATENCY_WINDOW)
+
+    @property
+    def requestCount(self) -> int:
+        """Return the number of requests sent so far."""
+        return self._requests
+
+    def latencyPercentile(self, fraction: float) -> float | None:
+        """Return a percentile of the latest latencies across all endpoints."""
+        return _percentile(self._recent, fraction)
+
+    def start(self, method: str, endpoint: str) -> RequestSample:
+        """Start measuring a request."""
+        sample = RequestSample(endpointClass(method, endpoint))
+        self._endpoint(sample.endpointClass).inFlight += 1
+        return sample
+
+    def finish(self, sample: RequestSample, error: bool = False) -> None:
+        """Record a request measured since start()."""
+        latency = time.monotonic() - sample.start
+        metrics = self._endpoint(sample.endpointClass)
+        metrics.inFlight -= 1
+        metrics.record(latency, sample.bytes, error)
+        self._requests += 1
+        self._recent.append(latency)
+
+    def _endpoint(self, name: str) -> EndpointMetrics:
+        """Return the metrics of an endpoint class, creating them if needed."""
+        metrics = self._endpoints.get(name)
+        if metrics is None:
+            metrics = self._endpoints[name] = EndpointMetrics()
+        return metrics
+
+    def getDiagnostics(self) -> Dict[str, Any]:
+        """Return the metrics for diagnostics."""
+        return {
+            "requests": self._requests,
+            "latency_p95": self.latencyPercentile(0.95),
+            "endpoints": {
+                name: metrics.getDiagnostics()
+                for name, metrics in sorted(self._endpoints.items())
+            },
+        }
+
+
+def endpointClass(method: str, endpoint: str) -> str:
+    """Group an endpoint by shape, replacing object IDs with {id}."""
+    parts = _API_PREFIX.sub("", endpoint).strip("/").split("/")
+    if len(parts) > 1:
+        parts[1] = "{id}"
+    return f"{method} {'/'.join(parts)}"
+
+
+def _percentile(values: deque, fraction: float) -> float | None:
+    """Return a percentile of the values, rounded to the millisecond."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(fraction * len(ordered)))
+    return round(ordered[index], 3)
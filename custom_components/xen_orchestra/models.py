@@ -0,0 +1,73 @@
+"""Data models for the Xen Orchestra integration."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Dict
+
+
+@dataclass(slots=True)
+class VMState:
+    """The fields of a VM the integration reads."""
+
+    uuid: str
+    name_label: str
+    power_state: str | None = None
+    tags: tuple[str, ...] = ()
+    # UUID of the host the VM runs on ($container)
+    container: str | None = None
+    # UUID of the pool the VM belongs to ($pool)
+    pool: str | None = None
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> VMState:
+        """Create the state from a decoded xo-server VM object."""
+        return cls(
+            uuid=data["uuid"],
+            name_label=data.get("name_label", "Unknown VM"),
+            power_state=data.get("power_state"),
+            tags=tuple(data.get("tags") or ()),
+            container=data.get("$container"),
+            pool=data.get("$pool"),
+        )
+
+
+@dataclass(slots=True)
+class HostState:
+    """The fields of a host the integration reads."""
+
+    uuid: str
+    name_label: str
+    power_state: str | None = None
+    enabled: bool | None = None
+    # UUID of the pool the host belongs to ($pool)
+    pool: str | None = None
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> HostState:
+        """Create the state from a decoded xo-server host object."""
+        return cls(
+            uuid=data["uuid"],
+            name_label=data.get("name_label", "Unknown Host"),
+            power_state=data.get("power_state"),
+            enabled=data.get("enabled"),
+            pool=data.get("$pool"),
+        )
+
+
+@dataclass(slots=True)
+class PoolState:
+    """The fields of a pool the integration reads."""
+
+    uuid: str
+    name_label: str
+    # UUID of the pool master host
+    master: str | None = None
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> PoolState:
+        """Create the state from a decoded xo-server pool object."""
+        return cls(
+            uuid=data["uuid"],
+            name_label=data.get("name_label", "Unknown Pool"),
+            master=data.get("master"),
+        )
@@ -0,0 +1,278 @@
+"""Adaptive request scheduler for the Xen Orchestra API client."""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict
+
+_LOGGER = logging.getLogger(__name__)
+
+# Request priorities, served in this order: control actions and targeted
+# refreshes first, then inventory crawls and stats polling
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BACKGROUND = 1
+
+
+class XenOrchestraAPIError(Exception):
+    """Error returned by the Xen Orchestra API with an HTTP status."""
+
+    def __init__(self, message: str, status: int | None = None) -> None:
+        """Initialize the error."""
+        super().__init__(message)
+        self.status = status
+
+    @property
+    def isOverload(self) -> bool:
+        """Return True when the status signals that xo-server is overloaded."""
+        return self.status is not None and (self.status == 429 or self.status >= 500)
+
+
+class AdaptiveRequestScheduler:
+    """Bound the number of concurrent requests and adapt it to xo-server.
+
+    The concurrency limit follows an AIMD policy: it grows by one after a
+    full window of fast, successful requests and is halved when a request
+    times out, is rate limited (429), fails with a 5xx or is slower than the
+    latency target.
+
+    Waiting requests are served by priority, then in FIFO order. Reserved
+    slots on top of the adaptive limit are only used by interactive
+    requests, so they do not queue behind a large refresh even once the
+    limit has been cut to its minimum.
+    """
+
+    def __init__(
+        self,
+        initial_limit: int = 4,
+        min_limit: int = 1,
+        max_limit: int = 16,
+        latency_target: float = 2.0,
+        reserved: int = 1,
+    ) -> None:
+        """Initialize the scheduler."""
+        self._minLimit = max(1, min_limit)
+        self._maxLimit = max(self._minLimit, max_limit)
+        self._limit = min(max(initial_limit, self._minLimit), self._maxLimit)
+        self._latencyTarget = latency_target
+        self._reserved = max(0, reserved)
+        self._inFlight = 0
+        self._waiters: Dict[int, deque[asyncio.Future]] = {
+            PRIORITY_INTERACTIVE: deque(),
+            PRIORITY_BACKGROUND: deque(),
+        }
+        self._interactiveCompleted = 0
+        self._successStreak = 0
+        self._lastDecrease = 0.0
+        self._completed = 0
+        self._congestionEvents = 0
+        self._lastLatency: float | None = None
+
+    @property
+    def limit(self) -> int:
+        """Return the current concurrency limit."""
+        return self._limit
+
+    @property
+    def inFlight(self) -> int:
+        """Return the number of requests currently running."""
+        return self._inFlight
+
+    @property
+    def queueDepth(self) -> int:
+        """Return the number of requests waiting for a slot."""
+        return sum(len(waiters) for waiters in self._waiters.values())
+
+    def _slots(self, priority: int) -> int:
+        """Return the number of slots requests of a priority may fill."""
+        if priority == PRIORITY_INTERACTIVE:
+            return self._limit + self._reserved
+        return self._limit
+
+    async def run(
+        self, request: Callable[[], Awaitable[Any]], priority: int = PRIORITY_BACKGROUND
+    ) -> Any:
+        """Run a request once a slot is free and feed its outcome to the limit."""
+        await self._acquire(priority)
+        if priority == PRIORITY_INTERACTIVE:
+            self._interactiveCompleted += 1
+        start = time.monotonic()
+        try:
+            result = await request()
+        except asyncio.TimeoutError:
+            self._onCongestion("timeout")
+            raise
+        except XenOrchestraAPIError as e:
+            if e.isOverload:
+                self._onCongestion(f"HTTP {e.status}")
+            raise
+        else:
+            self._onSuccess(time.monotonic() - start)
+            return result
+        finally:
+            self._release()
+
+    async def _acquire(self, priority: int) -> None:
+        """Wait until a request slot is available."""
+        waiters = self._waiters[priority]
+        ahead = any(
+            self._waiters[other] for other in self._waiters if other <= priority
+        )
+        if self._inFlight < self._slots(priority) and not ahead:
+            self._inFlight += 1
+            return
+
+        waiter = asyncio.get_running_loop().create_future()
+        waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over just before cancellation, give it back
+                self._release()
+            elif waiter in waiters:
+                waiters.remove(waiter)
+            raise
+
+    def _release(self) -> None:
+        """Free a request slot and wake as many waiters as the limit allows."""
+        self._inFlight -= 1
+        self._wakeWaiters()
+
+    def _wakeWaiters(self) -> None:
+        """Hand free slots to queued requests by priority, then in FIFO order."""
+        for priority in sorted(self._waiters):
+            waiters = self._waiters[priority]
+            while waiters and self._inFlight < self._slots(priority):
+                waiter = waiters.popleft()
+                if not waiter.done():
+                    self._inFlight += 1
+                    waiter.set_result(None)
+            if waiters:
+                # Lower priorities wait until these requests got a slot
+                return
+
+    def _onSuccess(self, latency: float) -> None:
+        """Additively increase the limit after a window of fast requests."""
+        self._completed += 1
+        self._lastLatency = latency
+        if latency > self._latencyTarget:
+            self._onCongestion(f"latency {latency:.2f}s")
+            return
+
+        self._successStreak += 1
+        if self._successStreak >= self._limit and self._limit < self._maxLimit:
+            self._limit += 1
+            self._successStreak = 0
+            _LOGGER.debug(f"Request concurrency increased to {self._limit}")
+            self._wakeWaiters()
+
+    def _onCongestion(self, reason: str) -> None:
+        """Halve the limit, at most once per latency target period."""
+        self._congestionEvents += 1
+        self._successStreak = 0
+        now = time.monotonic()
+        if now - self._lastDecrease < self._latencyTarget:
+            return
+        self._lastDecrease = now
+        new_limit = max(self._minLimit, self._limit // 2)
+        if new_limit != self._limit:
+            _LOGGER.debug(f"Request concurrency reduced from {self._limit} to {new_limit} ({reason})")
+            self._limit = new_limit
+
+    def getDiagnostics(self) -> Dict[str, Any]:
+        """Return the scheduler state for diagnostics."""
+        return {
+            "concurrency_limit": self._limit,
+            "min_limit": self._minLimit,
+            "max_limit": self._maxLimit,
+            "in_flight": self._inFlight,
+            "reserved_slots": self._reserved,
+            "queue_depth": {
+                "interactive": len(self._waiters[PRIORITY_INTERACTIVE]),
+                "background": len(self._waiters[PRIORITY_BACKGROUND]),
+            },
+            "interactive_requests": self._interactiveCompleted,
+            "completed": self._completed,
+            "congestion_events": self._congestionEvents,
+            "last_latency": self._lastLatency,
+        }
+
+
+class CircuitOpenError(XenOrchestraAPIError):
+    """Raised instead of sending a request while the circuit breaker is open."""
+
+
+class CircuitBreaker:
+    """Stop sending requests to an xo-server that keeps failing.
+
+    After failure_threshold consecutive transient failures (timeouts,
+    connection errors, 429 and 5xx) the circuit opens and requests fail
+    fast for reset_timeout seconds. A single probe request is then let
+    through; its outcome closes the circuit or opens it again.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0) -> None:
+        """Initialize the breaker."""
+        self._failureThreshold = max(1, failure_threshold)
+        self._resetTimeout = reset_timeout
+        self._failures = 0
+        self._openedAt: float | None = None
+        self._probeStartedAt: float | None = None
+        self._openCount = 0
+        self._rejected = 0
+
+    @property
+    def state(self) -> str:
+        """Return closed, open or half_open."""
+        if self._openedAt is None:
+            return "closed"
+        return "half_open" if self._probeStartedAt is not None else "open"
+
+    def check(self) -> None:
+        """Raise CircuitOpenError unless a request may be sent now."""
+        if self._openedAt is None:
+            return
+        now = time.monotonic()
+        probe_running = (
+            self._probeStartedAt is not None
+            and now - self._probeStartedAt < self._resetTimeout
+        )
+        if now - self._openedAt < self._resetTimeout or probe_running:
+            self._rejected += 1
+            raise CircuitOpenError("Xen Orchestra is failing, requests are paused")
+        # A probe that never reported back (e.g. cancelled) is replaced
+        self._probeStartedAt = now
+
+    def recordSuccess(self) -> None:
+        """Close the circuit after a request reached a responsive xo-server."""
+        if self._openedAt is not None:
+            _LOGGER.info("Xen Orchestra is responding again, resuming requests")
+        self._failures = 0
+        self._openedAt = None
+        self._probeStartedAt = None
+
+    def recordFailure(self) -> None:
+        """Count a transient failure, opening the circuit past the threshold."""
+        self._failures += 1
+        if self._probeStartedAt is not None:
+            # The probe failed, stay open for another period
+            self._openedAt = time.monotonic()
+            self._probeStartedAt = None
+        elif self._openedAt is None and self._failures >= self._failureThreshold:
+            self._openedAt = time.monotonic()
+            self._openCount += 1
+            _LOGGER.warning(
+                f"{self._failures} consecutive Xen Orchestra request failures, "
+                f"pausing requests for {self._resetTimeout}s"
+            )
+
+    def getDiagnostics(self) -> Dict[str, Any]:
+        """Return the breaker state for diagnostics."""
+        return {
+            "state": self.state,
+            "consecutive_failures": self._failures,
+            "times_opened": self._openCount,
+            "rejected_requests": self._rejected,
+        }
@@ -5,16 +5,31 @@ import logging
 from typing import TYPE_CHECKING
 
 from homeassistant.components.sensor import (
+    SensorDeviceClass,
     SensorEntity,
     SensorEntityDescription,
+    SensorStateClass,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.const import EntityCategory, UnitOfTime
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.device_registry import DeviceEntryType, DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DOMAIN, ICON_VM_RUNNING, ICON_HOST_CPU, ICON_HOST_MEMORY
+from .const import (
+    DOMAIN,
+    ICON_HOST_CPU,
+    ICON_HOST_MEMORY,
+    ICON_VM_CPU,
+    ICON_VM_DISK,
+    ICON_VM_MEMORY,
+    ICON_VM_NETWORK,
+    ICON_VM_RUNNING,
+    VM_STATE_RUNNING,
+)
 from .entity import XenOrchestraBaseEntity
+from .models import HostState, VMState
 
 if TYPE_CHECKING:
     from . import XenOrchestraDataUpdateCoordinator
@@ -45,6 +60,108 @@ HOST_SENSORS: tuple[SensorEntityDescription, ...] = (
     ),
 )
 
+# Backed by /rest/v0/vms/{id}/stats, disabled until the user opts in per VM
+VM_STATS_SENSORS: tuple[SensorEntityDescription, ...] = (
+    SensorEntityDescription(
+        key="cpu_usage",
+        name="CPU Usage",
+        icon=ICON_VM_CPU,
+        native_unit_of_measurement="%",
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_registry_enabled_default=False,
+    ),
+    SensorEntityDescription(
+        key="memory_usage",
+        name="Memory Usage",
+        icon=ICON_VM_MEMORY,
+        native_unit_of_measurement="%",
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_registry_enabled_default=False,
+    ),
+    SensorEntityDescription(
+        key="disk_read",
+        name="Disk Read",
+        icon=ICON_VM_DISK,
+        native_unit_of_measurement="B/s",
+        device_class=SensorDeviceClass.DATA_RATE,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_registry_enabled_default=False,
+    ),
+    SensorEntityDescription(
+        key="disk_write",
+        name="Disk Write",
+        icon=ICON_VM_DISK,
+        native_unit_of_measurement="B/s",
+        device_class=SensorDeviceClass.DATA_RATE,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_registry_enabled_default=False,
+    ),
+    SensorEntityDescription(
+        key="disk_read_iops",
+        name="Disk Read IOPS",
+        icon=ICON_VM_DISK,
+        native_unit_of_measurement="IOPS",
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_registry_enabled_default=False,
+    ),
+    SensorEntityDescription(
+        key="disk_write_iops",
+        name="Disk Write IOPS",
+        icon=ICON_VM_DISK,
+        native_unit_of_measurement="IOPS",
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_registry_enabled_default=False,
+    ),
+    SensorEntityDescription(
+        key="network_rx",
+        name="Network Receive",
+        icon=ICON_VM_NETWORK,
+        native_unit_of_measurement="B/s",
+        device_class=SensorDeviceClass.DATA_RATE,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_registry_enabled_default=False,
+    ),
+    SensorEntityDescription(
+        key="network_tx",
+        name="Network Transmit",
+        icon=ICON_VM_NETWORK,
+        native_unit_of_measurement="B/s",
+        device_class=SensorDeviceClass.DATA_RATE,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_registry_enabled_default=False,
+    ),
+)
+
+# Refresh instrumentation of the Xen Orchestra instance itself
+DIAGNOSTIC_SENSORS: tuple[SensorEntityDescription, ...] = (
+    SensorEntityDescription(
+        key="last_refresh_duration",
+        name="Last Refresh Duration",
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+    ),
+    SensorEntityDescription(
+        key="refresh_requests",
+        name="Requests Per Refresh",
+        native_unit_of_measurement="requests",
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+    ),
+    SensorEntityDescription(
+        key="request_latency_p95",
+        name="Request Latency P95",
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+    ),
+)
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -56,34 +173,40 @@ async def async_setup_entry(
         entry.entry_id
     ]["coordinator"]
 
-    entities = []
-    _LOGGER.debug(f"Sensor platform setup - Coordinator data: {coordinator.data}")
-    
-    if coordinator.data:
-        vms = coordinator.data.get("vms", [])
-        hosts = coordinator.data.get("hosts", [])
-        _LOGGER.debug(f"Sensor platform setup - Found {len(vms)} VMs and {len(hosts)} hosts")
-        
-        # Create VM entities
-        for vm_data in vms:
-            _LOGGER.debug(f"Creating sensor for VM: {vm_data.get('name_label', 'Unknown')} ({vm_data.get('uuid', 'No UUID')})")
+    @callback
+    def _async_add_vms(vms: list[VMState]) -> None:
+        _LOGGER.debug(f"Adding sensors for {len(vms)} VMs")
+        entities: list[SensorEntity] = []
+        for vm in vms:
             for description in SENSORS:
                 entities.append(
-                    XenOrchestraVMStatusSensor(coordinator, vm_data, description)
+                    XenOrchestraVMStatusSensor(coordinator, vm, description)
                 )
-        
-        # Create host sensors
-        for host_data in hosts:
-            _LOGGER.debug(f"Creating sensors for host: {host_data.get('name_label', 'Unknown')} ({host_data.get('uuid', 'No UUID')})")
-            for description in HOST_SENSORS:
+            for description in VM_STATS_SENSORS:
                 entities.append(
-                    XenOrchestraHostSensor(coordinator, host_data, description)
+                    XenOrchestraVMStatsSensor(coordinator, vm, description)
                 )
-    else:
-        _LOGGER.warning("Sensor platform setup - No coordinator data available")
+        async_add_entities(entities)
+
+    @callback
+    def _async_add_hosts(hosts: list[HostState]) -> None:
+        _LOGGER.debug(f"Adding sensors for {len(hosts)} hosts")
+        async_add_entities(
+            XenOrchestraHostSensor(coordinator, host, description)
+            for host in hosts
+            for description in HOST_SENSORS
+        )
+
+    async_add_entities(
+        XenOrchestraDiagnosticSensor(coordinator, entry, description)
+        for description in DIAGNOSTIC_SENSORS
+    )
 
-    _LOGGER.debug(f"Adding {len(entities)} sensor entities")
-    async_add_entities(entities)
+    # Called now for the known objects and again whenever new ones appear
+    entry.async_on_unload(coordinator.async_add_object_listener("vms", _async_add_vms))
+    entry.async_on_unload(
+        coordinator.async_add_object_listener("hosts", _async_add_hosts)
+    )
 
 
 class XenOrchestraVMStatusSensor(XenOrchestraBaseEntity, SensorEntity):
@@ -92,26 +215,18 @@ class XenOrchestraVMStatusSensor(XenOrchestraBaseEntity, SensorEntity):
     def __init__(
         self,
         coordinator: "XenOrchestraDataUpdateCoordinator",
-        vm_data: dict,
+        vm: VMState,
         description: SensorEntityDescription,
     ) -> None:
         """Initialize the sensor."""
         self.entity_description = description
-        super().__init__(coordinator, vm_data)
+        super().__init__(coordinator, vm)
 
     @property
     def native_value(self) -> str | None:
         """Return the state of the sensor."""
-        vm_uuid = self._vm_data["uuid"]
-        vm_info = next(
-            (
-                vm
-                for vm in self.coordinator.data.get("vms", [])
-                if vm["uuid"] == vm_uuid
-            ),
-            None,
-        )
-        return vm_info.get("power_state") if vm_info else None
+        vm_info = self._get_current_vm_data()
+        return vm_info.power_state if vm_info else None
 
 
 class XenOrchestraHostSensor(CoordinatorEntity, SensorEntity):
@@ -120,26 +235,32 @@ class XenOrchestraHostSensor(CoordinatorEntity, SensorEntity):
     def __init__(
         self,
         coordinator: "XenOrchestraDataUpdateCoordinator",
-        host_data: dict,
+        host: HostState,
         description: SensorEntityDescription,
     ) -> None:
         """Initialize the sensor."""
         self.entity_description = description
-        self._host_data = host_data
+        self._host_uuid = host.uuid
         super().__init__(coordinator)
         
         # Set device info for host entities
         self._attr_device_info = {
-            "identifiers": {(DOMAIN, self._host_data["uuid"])},
-            "name": self._host_data.get("name_label", "Unknown Host"),
+            "identifiers": {(DOMAIN, host.uuid)},
+            "name": host.name_label,
             "manufacturer": "Vates",
             "model": "XenServer Host",
         }
         
         # Set unique ID for host entities
-        self._attr_unique_id = f"{self._host_data['uuid']}_{self.entity_description.key}"
+        self._attr_unique_id = f"{host.uuid}_{self.entity_description.key}"
         self._attr_has_entity_name = True
 
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write state only when this host or its stats changed."""
+        if self.coordinator.async_object_changed(self._host_uuid):
+            super()._handle_coordinator_update()
+
     @property
     def available(self) -> bool:
         """Return if entity is available."""
@@ -147,31 +268,31 @@ class XenOrchestraHostSensor(CoordinatorEntity, SensorEntity):
             return False
             
         # Check if the host still exists in the coordinator data
-        hosts = self.coordinator.data.get("hosts", [])
-        host_uuid = self._host_data["uuid"]
-        
-        # Find this host in the current data
-        current_host = next((host for host in hosts if host.get("uuid") == host_uuid), None)
-        
-        if not current_host:
+        host_uuid = self._host_uuid
+        if self.coordinator.get_host(host_uuid) is None:
             _LOGGER.debug(f"Host {host_uuid} not found in current data - marking unavailable")
             return False
             
         # Check if we can get host stats (indicates host is responding)
-        host_stats = self.coordinator.data.get("host_stats", {}).get(host_uuid)
+        host_stats = self.coordinator.get_host_stats(host_uuid)
         if not host_stats:
             _LOGGER.debug(f"No stats available for host {host_uuid} - marking unavailable")
             return False
             
         return True
 
+    @property
+    def extra_state_attributes(self) -> dict[str, bool]:
+        """Return whether the value comes from an earlier refresh."""
+        return {"stale": self.coordinator.is_host_stale(self._host_uuid)}
+
     @property
     def native_value(self) -> float | None:
         """Return the state of the sensor."""
-        host_uuid = self._host_data["uuid"]
+        host_uuid = self._host_uuid
         
         # Get host stats from coordinator data
-        host_stats = self.coordinator.data.get("host_stats", {}).get(host_uuid)
+        host_stats = self.coordinator.get_host_stats(host_uuid)
         
         if not host_stats:
             return None
@@ -179,37 +300,175 @@ class XenOrchestraHostSensor(CoordinatorEntity, SensorEntity):
         stats = host_stats.get("stats", {})
         
         if self.entity_description.key == "cpu_usage":
-            # Calculate average CPU usage across all cores
-            cpus = stats.get("cpus", {})
-            if isinstance(cpus, dict):
-                total_usage = 0
-                core_count = 0
-                
-                # Iterate through CPU cores (like "0", "1", "2", etc.)
-                for core_id, usage_array in cpus.items():
-                    if isinstance(usage_array, list) and usage_array:
-                        # Use the last (most recent) value from the array
-                        total_usage += usage_array[-1]
-                        core_count += 1
-                
-                if core_count > 0:
-                    avg_usage = total_usage / core_count
-                    return round(avg_usage, 2)
-            return None
+            return _cpu_usage(stats)
             
         elif self.entity_description.key == "memory_usage":
-            # Calculate memory usage percentage
-            memory_array = stats.get("memory", [])
-            memory_free_array = stats.get("memoryFree", [])
-            
-            if (isinstance(memory_array, list) and memory_array and 
-                isinstance(memory_free_array, list) and memory_free_array):
-                # Use the last (most recent) values from the arrays
-                total_memory = memory_array[-1]
-                free_memory = memory_free_array[-1]
-                
-                if total_memory > 0:
-                    used_memory = total_memory - free_memory
-                    usage_percent = (used_memory / total_memory) * 100
-                    return round(usage_percent, 2)
-            return None
\ No newline at end of file
+            return _memory_usage(stats)
+
+
+class XenOrchestraVMStatsSensor(XenOrchestraBaseEntity, SensorEntity):
+    """Defines a Xen Orchestra VM performance sensor.
+
+    These sensors are disabled by default; the coordinator only fetches
+    stats for running VMs that have at least one of them enabled.
+    """
+
+    def __init__(
+        self,
+        coordinator: "XenOrchestraDataUpdateCoordinator",
+        vm: VMState,
+        description: SensorEntityDescription,
+    ) -> None:
+        """Initialize the sensor."""
+        self.entity_description = description
+        super().__init__(coordinator, vm)
+
+    async def async_added_to_hass(self) -> None:
+        """Select the VM for stats collection while this sensor exists."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self.coordinator.async_subscribe_vm_stats(self._vm_uuid)
+        )
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write state when this VM or its stats changed in the last refresh."""
+        if self.coordinator.async_object_changed(self._vm_uuid, stats=True):
+            self.async_write_ha_state()
+
+    @property
+    def available(self) -> bool:
+        """Return if entity is available."""
+        if not super().available:
+            return False
+        vm_info = self._get_current_vm_data()
+        return vm_info.power_state == VM_STATE_RUNNING and bool(
+            self.coordinator.get_vm_stats(self._vm_uuid)
+        )
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the state of the sensor."""
+        vm_stats = self.coordinator.get_vm_stats(self._vm_uuid)
+        if not vm_stats:
+            return None
+
+        stats = vm_stats.get("stats", {})
+        key = self.entity_description.key
+
+        if key == "cpu_usage":
+            return _cpu_usage(stats)
+        elif key == "memory_usage":
+            return _memory_usage(stats)
+        elif key == "disk_read":
+            return _latest_total(stats.get("xvds", {}).get("r"))
+        elif key == "disk_write":
+            return _latest_total(stats.get("xvds", {}).get("w"))
+        elif key == "disk_read_iops":
+            return _latest_total(stats.get("iops", {}).get("r"))
+        elif key == "disk_write_iops":
+            return _latest_total(stats.get("iops", {}).get("w"))
+        elif key == "network_rx":
+            return _latest_total(stats.get("vifs", {}).get("rx"))
+        elif key == "network_tx":
+            return _latest_total(stats.get("vifs", {}).get("tx"))
+        return None
+
+
+class XenOrchestraDiagnosticSensor(CoordinatorEntity, SensorEntity):
+    """Defines a sensor reporting how the refreshes of Xen Orchestra perform."""
+
+    _attr_has_entity_name = True
+
+    def __init__(
+        self,
+        coordinator: "XenOrchestraDataUpdateCoordinator",
+        entry: ConfigEntry,
+        description: SensorEntityDescription,
+    ) -> None:
+        """Initialize the sensor."""
+        self.entity_description = description
+        super().__init__(coordinator)
+        self._attr_unique_id = f"{entry.entry_id}_{description.key}"
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, entry.entry_id)},
+            name=entry.title,
+            manufacturer="Vates",
+            model="Xen Orchestra",
+            entry_type=DeviceEntryType.SERVICE,
+        )
+
+    @property
+    def available(self) -> bool:
+        """Return if entity is available, failed refreshes are measured too."""
+        return bool(self.coordinator.refresh_metrics)
+
+    @property
+    def native_value(self) -> float | int | None:
+        """Return the state of the sensor."""
+        key = self.entity_description.key
+        if key == "last_refresh_duration":
+            return self.coordinator.refresh_metrics.get("duration")
+        elif key == "refresh_requests":
+            return self.coordinator.refresh_metrics.get("requests")
+        elif key == "request_latency_p95":
+            return self.coordinator.api.metrics.latencyPercentile(0.95)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, float] | None:
+        """Return the phase timings of the last refresh."""
+        if self.entity_description.key == "last_refresh_duration":
+            return self.coordinator.refresh_metrics.get("phases")
+        return None
+
+
+def _cpu_usage(stats: dict) -> float | None:
+    """Calculate the average CPU usage across all cores."""
+    cpus = stats.get("cpus", {})
+    if isinstance(cpus, dict):
+        total_usage = 0
+        core_count = 0
+        
+        # Iterate through CPU cores (like "0", "1", "2", etc.)
+        for core_id, usage_array in cpus.items():
+            if isinstance(usage_array, list) and usage_array:
+                # Use the last (most recent) value from the array
+                total_usage += usage_array[-1]
+                core_count += 1
+        
+        if core_count > 0:
+            avg_usage = total_usage / core_count
+            return round(avg_usage, 2)
+    return None
+
+
+def _memory_usage(stats: dict) -> float | None:
+    """Calculate the memory usage percentage."""
+    memory_array = stats.get("memory", [])
+    memory_free_array = stats.get("memoryFree", [])
+    
+    if (isinstance(memory_array, list) and memory_array and 
+        isinstance(memory_free_array, list) and memory_free_array):
+        # Use the last (most recent) values from the arrays
+        total_memory = memory_array[-1]
+        free_memory = memory_free_array[-1]
+        
+        if total_memory > 0:
+            used_memory = total_memory - free_memory
+            usage_percent = (used_memory / total_memory) * 100
+            return round(usage_percent, 2)
+    return None
+
+
+def _latest_total(series_by_device: dict | None) -> float | None:
+    """Sum the most recent sample of every device (disk or interface)."""
+    if not isinstance(series_by_device, dict):
+        return None
+    samples = [
+        series[-1]
+        for series in series_by_device.values()
+        if isinstance(series, list) and series
+    ]
+    if not samples:
+        return None
+    return round(sum(samples), 2)
@@ -0,0 +1,151 @@
+"""Services for the Xen Orchestra integration."""
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import TYPE_CHECKING, Any
+
+import voluptuous as vol
+
+from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.helpers import config_validation as cv
+
+from .const import (
+    ATTR_ACTION,
+    ATTR_FAILED,
+    ATTR_MAX_CONCURRENCY,
+    ATTR_POOL,
+    ATTR_TAGS,
+    ATTR_TASKS,
+    ATTR_VMS,
+    BULK_VM_ACTIONS,
+    DEFAULT_BULK_CONCURRENCY,
+    DOMAIN,
+    EVENT_BULK_VM_ACTION,
+    MAX_BULK_CONCURRENCY,
+    SERVICE_BULK_VM_ACTION,
+)
+
+if TYPE_CHECKING:
+    from . import XenOrchestraDataUpdateCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+BULK_VM_ACTION_SCHEMA = vol.All(
+    vol.Schema(
+        {
+            vol.Required(ATTR_ACTION): vol.In(BULK_VM_ACTIONS),
+            vol.Optional(ATTR_VMS): vol.All(cv.ensure_list, [cv.string]),
+            vol.Optional(ATTR_TAGS): vol.All(cv.ensure_list, [cv.string]),
+            vol.Optional(ATTR_POOL): cv.string,
+            vol.Optional(ATTR_MAX_CONCURRENCY, default=DEFAULT_BULK_CONCURRENCY): vol.All(
+                vol.Coerce(int), vol.Range(min=1, max=MAX_BULK_CONCURRENCY)
+            ),
+        }
+    ),
+    cv.has_at_least_one_key(ATTR_VMS, ATTR_TAGS, ATTR_POOL),
+)
+
+
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the integration services once for all config entries."""
+    if hass.services.has_service(DOMAIN, SERVICE_BULK_VM_ACTION):
+        return
+
+    async def _async_bulk_vm_action(call: ServiceCall) -> None:
+        await async_bulk_vm_action(hass, call)
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_BULK_VM_ACTION,
+        _async_bulk_vm_action,
+        schema=BULK_VM_ACTION_SCHEMA,
+    )
+
+
+def async_unload_services(hass: HomeAssistant) -> None:
+    """Remove the integration services once the last config entry is unloaded."""
+    if hass.data.get(DOMAIN):
+        return
+    hass.services.async_remove(DOMAIN, SERVICE_BULK_VM_ACTION)
+
+
+async def async_bulk_vm_action(hass: HomeAssistant, call: ServiceCall) -> None:
+    """Run a VM action on every matching VM with bounded concurrency.
+
+    VMs are matched across all config entries by UUID or name, by tag or by
+    pool. Every started task is tracked until it ends so only its VM is
+    refreshed; VMs whose action reported no task are refreshed together
+    right away. An event reports the started tasks and failures.
+    """
+    action: str = call.data[ATTR_ACTION]
+    semaphore = asyncio.Semaphore(call.data[ATTR_MAX_CONCURRENCY])
+    tasks: dict[str, str | None] = {}
+    failed: dict[str, str] = {}
+
+    targets: list[tuple["XenOrchestraDataUpdateCoordinator", list[str]]] = []
+    for entry_data in hass.data.get(DOMAIN, {}).values():
+        coordinator = entry_data["coordinator"]
+        vm_ids = _match_vms(coordinator, call.data)
+        if vm_ids:
+            targets.append((coordinator, vm_ids))
+
+    if not targets:
+        _LOGGER.warning(f"No Xen Orchestra VM matches the {action} request")
+        return
+
+    async def _run(coordinator: "XenOrchestraDataUpdateCoordinator", vm_id: str) -> None:
+        async with semaphore:
+            try:
+                tasks[vm_id] = await coordinator.api.vmAction(vm_id, action)
+            except Exception as e:
+                failed[vm_id] = str(e)
+
+    await asyncio.gather(
+        *(_run(coordinator, vm_id) for coordinator, vm_ids in targets for vm_id in vm_ids)
+    )
+    _LOGGER.info(
+        f"Bulk {action} dispatched to {len(tasks)} VMs ({len(failed)} failed)"
+    )
+
+    for coordinator, vm_ids in targets:
+        untracked = []
+        for vm_id in vm_ids:
+            if tasks.get(vm_id):
+                coordinator.tasks.async_track(tasks[vm_id], vm_id, action)
+            elif vm_id in tasks:
+                untracked.append(vm_id)
+        if untracked:
+            # One targeted refresh per Xen Orchestra instance instead of one per VM
+            await coordinator.async_refresh_objects(vms=untracked)
+
+    hass.bus.async_fire(
+        EVENT_BULK_VM_ACTION,
+        {ATTR_ACTION: action, ATTR_TASKS: tasks, ATTR_FAILED: failed},
+    )
+
+
+def _match_vms(
+    coordinator: "XenOrchestraDataUpdateCoordinator", selection: dict[str, Any]
+) -> list[str]:
+    """Return the UUIDs of the coordinator's VMs matching a service call."""
+    if not coordinator.data:
+        return []
+
+    names = set(selection.get(ATTR_VMS, ()))
+    tags = set(selection.get(ATTR_TAGS, ()))
+    pool = selection.get(ATTR_POOL)
+    pool_ids = {
+        uuid
+        for uuid, pool_state in coordinator.data.get("pools", {}).items()
+        if pool in (uuid, pool_state.name_label)
+    }
+
+    return [
+        vm.uuid
+        for vm in coordinator.data.get("vms", {}).values()
+        if vm.uuid in names
+        or vm.name_label in names
+        or tags.intersection(vm.tags)
+        or (vm.pool is not None and vm.pool in pool_ids)
+    ]
@@ -1,19 +1,41 @@
 """Switch platform for Xen Orchestra."""
 from __future__ import annotations
 
-from typing import Any, TYPE_CHECKING
+import logging
+from typing import Any, Awaitable, Callable, TYPE_CHECKING
 
 from homeassistant.components.switch import SwitchEntity, SwitchEntityDescription
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from .const import DOMAIN, ICON_VM_POWER, ICON_VM_RUNNING, ICON_VM_STOPPED, VM_STATE_RUNNING
+from .const import (
+    ATTR_ACTION,
+    ATTR_TRANSITION,
+    ATTR_VM_ID,
+    DOMAIN,
+    EVENT_ACTION_FAILED,
+    ICON_VM_POWER,
+    ICON_VM_RUNNING,
+    ICON_VM_STOPPED,
+    TRANSITION_STARTING,
+    TRANSITION_STOPPING,
+    VM_STATE_HALTED,
+    VM_STATE_RUNNING,
+)
 from .entity import XenOrchestraBaseEntity
+from .models import VMState
 
 if TYPE_CHECKING:
     from . import XenOrchestraDataUpdateCoordinator
 
+_LOGGER = logging.getLogger(__name__)
+
+# Power state each optimistic transition ends in
+TRANSITION_TARGETS = {
+    TRANSITION_STARTING: VM_STATE_RUNNING,
+    TRANSITION_STOPPING: VM_STATE_HALTED,
+}
 
 SWITCHES: tuple[SwitchEntityDescription, ...] = (
     SwitchEntityDescription(
@@ -34,43 +56,63 @@ async def async_setup_entry(
         entry.entry_id
     ]["coordinator"]
 
-    entities = []
-    if coordinator.data:
-        for vm_data in coordinator.data.get("vms", []):
-            for description in SWITCHES:
-                entities.append(
-                    XenOrchestraVMPowerSwitch(coordinator, vm_data, description)
-                )
+    @callback
+    def _async_add_vms(vms: list[VMState]) -> None:
+        async_add_entities(
+            XenOrchestraVMPowerSwitch(coordinator, vm, description)
+            for vm in vms
+            for description in SWITCHES
+        )
 
-    async_add_entities(entities)
+    # Called now for the known VMs and again whenever new VMs appear
+    entry.async_on_unload(coordinator.async_add_object_listener("vms", _async_add_vms))
 
 
 class XenOrchestraVMPowerSwitch(XenOrchestraBaseEntity, SwitchEntity):
-    """Defines a Xen Orchestra VM Power Switch."""
+    """Defines a Xen Orchestra VM Power Switch.
+
+    Turning the switch on or off shows the requested state right away with a
+    starting/stopping transition attribute. The transition ends when the VM
+    reports the target power state or the action's task ends, and the
+    previous state comes back if the action fails.
+    """
 
     def __init__(
         self,
         coordinator: "XenOrchestraDataUpdateCoordinator",
-        vm_data: dict,
+        vm: VMState,
         description: SwitchEntityDescription,
     ) -> None:
         """Initialize the switch."""
         self.entity_description = description
-        super().__init__(coordinator, vm_data)
+        super().__init__(coordinator, vm)
+        # Pending optimistic transition and the action it belongs to
+        self._transition: str | None = None
+        self._transition_action = 0
 
     @property
     def is_on(self) -> bool:
         """Return the state of the switch."""
-        vm_uuid = self._vm_data["uuid"]
-        vm_info = next(
-            (
-                vm
-                for vm in self.coordinator.data.get("vms", [])
-                if vm["uuid"] == vm_uuid
-            ),
-            None,
-        )
-        return vm_info.get("power_state") == VM_STATE_RUNNING if vm_info else False
+        if self._transition is not None:
+            return self._transition == TRANSITION_STARTING
+        vm_info = self._get_current_vm_data()
+        return vm_info.power_state == VM_STATE_RUNNING if vm_info else False
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the pending power transition, if any, and whether the state is stale."""
+        return {ATTR_TRANSITION: self._transition, "stale": self.coordinator.is_stale}
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """End the transition once the VM reports its target power state."""
+        if self._transition is not None:
+            vm_info = self._get_current_vm_data()
+            if vm_info is None or vm_info.power_state == TRANSITION_TARGETS[self._transition]:
+                self._transition = None
+                self.async_write_ha_state()
+                return
+        super()._handle_coordinator_update()
 
     @property
     def icon(self) -> str:
@@ -82,12 +124,52 @@ class XenOrchestraVMPowerSwitch(XenOrchestraBaseEntity, SwitchEntity):
 
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Turn on the switch."""
-        api = self.coordinator.api
-        await api.startVM(self._vm_data["uuid"])
-        await self.coordinator.async_request_refresh()
+        await self._async_power_action(
+            "start", TRANSITION_STARTING, self.coordinator.api.startVM
+        )
 
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn off the switch."""
-        api = self.coordinator.api
-        await api.stopVM(self._vm_data["uuid"])
-        await self.coordinator.async_request_refresh()
\ No newline at end of file
+        await self._async_power_action(
+            "clean_shutdown", TRANSITION_STOPPING, self.coordinator.api.stopVM
+        )
+
+    async def _async_power_action(
+        self,
+        action: str,
+        transition: str,
+        request: Callable[[str], Awaitable[str | None]],
+    ) -> None:
+        """Show the transition, run the action and follow its task."""
+        self._transition = transition
+        self._transition_action += 1
+        action_id = self._transition_action
+        self.async_write_ha_state()
+
+        try:
+            task_id = await request(self._vm_uuid)
+        except Exception as err:
+            self._async_end_transition(action_id, action, str(err))
+            raise
+
+        @callback
+        def _on_done(status: str | None) -> None:
+            error = None if status in (None, "success") else f"task {status}"
+            self._async_end_transition(action_id, action, error)
+
+        self.coordinator.async_track_action(self._vm_uuid, action, task_id, _on_done)
+
+    @callback
+    def _async_end_transition(self, action_id: int, action: str, error: str | None) -> None:
+        """Drop the transition of an action, rolling back if it failed."""
+        if action_id != self._transition_action or self._transition is None:
+            # Already reconciled, or superseded by a newer action
+            return
+        self._transition = None
+        if error is not None:
+            _LOGGER.warning(f"{action} of VM {self._vm_uuid} failed, restoring its state: {error}")
+            self.hass.bus.async_fire(
+                EVENT_ACTION_FAILED,
+                {ATTR_VM_ID: self._vm_uuid, ATTR_ACTION: action, "error": error},
+            )
+        self.async_write_ha_state()
\ No newline at end of file
@@ -0,0 +1,159 @@
+"""Tracking of the asynchronous Xen Orchestra tasks started by actions."""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import TYPE_CHECKING, Any, Callable
+
+from homeassistant.core import HomeAssistant, callback
+
+from .api import isTransientError
+from .const import (
+    ATTR_ACTION,
+    ATTR_VM_ID,
+    DOMAIN,
+    EVENT_TASK,
+    TASK_POLL_MAX_DELAY,
+    TASK_POLL_MIN_DELAY,
+    TASK_TIMEOUT,
+)
+
+if TYPE_CHECKING:
+    from . import XenOrchestraDataUpdateCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+TASK_STATUS_PENDING = "pending"
+
+
+class XenOrchestraTaskTracker:
+    """Follow xo-server tasks until they end and refresh the affected VM.
+
+    Every tracked task is polled with exponential backoff. Progress changes
+    and the final status are fired as ``xen_orchestra_task`` events, and
+    once the task ended only the VM it acted on is refreshed.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, coordinator: "XenOrchestraDataUpdateCoordinator"
+    ) -> None:
+        """Initialize the tracker."""
+        self._hass = hass
+        self._coordinator = coordinator
+        self._tasks: dict[str, asyncio.Task] = {}
+
+    @property
+    def pending(self) -> int:
+        """Return the number of tasks being tracked."""
+        return len(self._tasks)
+
+    @callback
+    def async_track(
+        self,
+        task_id: str,
+        vm_id: str,
+        action: str,
+        on_done: Callable[[str | None], None] | None = None,
+    ) -> None:
+        """Start following a task started by an action on a VM.
+
+        on_done is called with the final task status, or None if the task
+        could not be followed, once the VM has been refreshed.
+        """
+        if task_id in self._tasks:
+            return
+        self._tasks[task_id] = self._hass.async_create_background_task(
+            self._async_follow(task_id, vm_id, action, on_done),
+            f"{DOMAIN} task {task_id}",
+        )
+
+    async def async_stop(self) -> None:
+        """Stop following every task."""
+        tasks = list(self._tasks.values())
+        self._tasks.clear()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _async_follow(
+        self,
+        task_id: str,
+        vm_id: str,
+        action: str,
+        on_done: Callable[[str | None], None] | None,
+    ) -> None:
+        """Poll a task until it ends, then refresh its VM."""
+        try:
+            task = await self._async_wait(task_id, vm_id, action)
+            # Even when the task could not be followed to its end, the VM is
+            # refreshed so its state does not wait for the next poll
+            await self._coordinator.async_refresh_vm(vm_id)
+            if on_done is not None:
+                on_done(task.get("status") if task else None)
+        finally:
+            self._tasks.pop(task_id, None)
+
+    async def _async_wait(
+        self, task_id: str, vm_id: str, action: str
+    ) -> dict[str, Any] | None:
+        """Return the ended task, or None if it could not be followed."""
+        deadline = time.monotonic() + TASK_TIMEOUT
+        delay = TASK_POLL_MIN_DELAY
+        progress = None
+        while time.monotonic() < deadline:
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, TASK_POLL_MAX_DELAY)
+            try:
+                task = await self._coordinator.api.getTask(task_id)
+            except Exception as e:
+                if not isTransientError(e):
+                    # The task is gone or cannot be read, polling will not help
+                    _LOGGER.warning(f"Stopped following task {task_id} ({action} of VM {vm_id}): {e}")
+                    return None
+                _LOGGER.debug(f"Polling task {task_id} failed: {e}")
+                continue
+
+            status = task.get("status", TASK_STATUS_PENDING)
+            if status != TASK_STATUS_PENDING:
+                _LOGGER.debug(f"Task {task_id} ({action} of VM {vm_id}) ended: {status}")
+                self._fire(task_id, vm_id, action, task, status)
+                return task
+
+            current = _progress(task)
+            if current is not None and current != progress:
+                progress = current
+                self._fire(task_id, vm_id, action, task, status)
+
+        _LOGGER.warning(f"Gave up following task {task_id} ({action} of VM {vm_id})")
+        return None
+
+    @callback
+    def _fire(
+        self,
+        task_id: str,
+        vm_id: str,
+        action: str,
+        task: dict[str, Any],
+        status: str,
+    ) -> None:
+        """Fire an event describing the state of a task."""
+        data = {
+            "task_id": task_id,
+            ATTR_VM_ID: vm_id,
+            ATTR_ACTION: action,
+            "status": status,
+            "progress": _progress(task),
+        }
+        result = task.get("result")
+        if status != "success" and isinstance(result, dict) and result.get("message"):
+            data["error"] = result["message"]
+        self._hass.bus.async_fire(EVENT_TASK, data)
+
+
+def _progress(task: dict[str, Any]) -> Any:
+    """Return the progress reported by a task, if any."""
+    progress = task.get("progress")
+    if progress is None:
+        progress = (task.get("properties") or {}).get("progress")
+    return progress
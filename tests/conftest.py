@@ -0,0 +1,11 @@
+"""Shared test setup for the Xen Orchestra integration."""
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "benchmarks"))
+
+from harness import install_integration_package  # noqa: E402
+
+install_integration_package()
@@ -0,0 +1,193 @@
+"""Tests for the API client against the mock xo-server."""
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Awaitable, Callable
+
+import pytest
+
+pytest.importorskip("aiohttp")
+
+from harness import serve_mock  # noqa: E402
+from mock_xo_server import MockOptions, MockXoServer  # noqa: E402
+
+from custom_components.xen_orchestra import api as api_module  # noqa: E402
+from custom_components.xen_orchestra.api import XenOrchestraAPI  # noqa: E402
+from custom_components.xen_orchestra.scheduler import (  # noqa: E402
+    CircuitOpenError,
+    XenOrchestraAPIError,
+)
+
+
+@pytest.fixture(autouse=True)
+def no_retry_delay(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Retry failed requests at once."""
+    monkeypatch.setattr(api_module, "REQUEST_RETRY_BASE_DELAY", 0)
+
+
+async def _with_api(
+    options: MockOptions,
+    scenario: Callable[[XenOrchestraAPI, MockXoServer], Awaitable[Any]],
+) -> Any:
+    """Run a scenario with a client of a freshly served mock server."""
+    async with serve_mock(options) as (server, url):
+        api = XenOrchestraAPI(url, "test-token", ssl_verify=False)
+        try:
+            return await scenario(api, server)
+        finally:
+            await api.close()
+
+
+@pytest.mark.parametrize("projection", [True, False])
+def test_projection_detection(projection: bool) -> None:
+    """Projected listings are used when honoured, objects fetched one by one otherwise."""
+
+    async def scenario(api: XenOrchestraAPI, server: MockXoServer) -> None:
+        vms = await api.getVMs()
+        assert sorted(vm.uuid for vm in vms) == sorted(server.objects["vms"])
+        assert api.supportsProjection is projection
+        detail_requests = server.stats.requests["GET vms/{id}"]
+        assert detail_requests == (0 if projection else len(vms))
+
+    asyncio.run(_with_api(MockOptions(vms=10, hosts=2, projection=projection), scenario))
+
+
+def test_projection_rejected_falls_back() -> None:
+    """A 4xx answer to ?fields= falls back to the plain listing for good."""
+
+    async def scenario(api: XenOrchestraAPI, server: MockXoServer) -> None:
+        vms = await api.getVMs()
+        assert len(vms) == 5
+        assert api.supportsProjection is False
+        server.stats.reset()
+        await api.getVMs()
+        assert server.stats.requests["GET vms"] == 1
+
+    asyncio.run(_with_api(MockOptions(vms=5, hosts=1, projection_status=400), scenario))
+
+
+def test_transient_failure_leaves_projection_undecided() -> None:
+    """An overloaded server says nothing about projection support."""
+
+    async def scenario(api: XenOrchestraAPI, server: MockXoServer) -> None:
+        with pytest.raises(XenOrchestraAPIError) as error:
+            await api.getVMs()
+        assert error.value.status == 503
+        assert api.supportsProjection is None
+        # No plain listing was tried on the strength of the failure
+        assert server.stats.requests["GET vms"] == api_module.REQUEST_RETRY_ATTEMPTS
+        server.options.projection_status = 0
+        assert len(await api.getVMs()) == 5
+        assert api.supportsProjection is True
+
+    asyncio.run(_with_api(MockOptions(vms=5, hosts=1, projection_status=503), scenario))
+
+
+def test_unchanged_vm_listing_is_revalidated() -> None:
+    """An unchanged VM listing is answered with a 304 and the cached models."""
+
+    async def scenario(api: XenOrchestraAPI, server: MockXoServer) -> None:
+        first = await api.getVMs()
+        states = await api.getVMPowerStates()
+        assert server.stats.not_modified == 0
+
+        assert await api.getVMs() is first
+        assert await api.getVMPowerStates() == states
+        assert server.stats.not_modified == 2
+        assert server.stats.requests["GET vms"] == 4
+
+        vm = next(iter(server.objects["vms"].values()))
+        vm["power_state"] = "Paused"
+        states = await api.getVMPowerStates()
+        assert states[vm["uuid"]] == "Paused"
+        assert server.stats.not_modified == 2
+
+    asyncio.run(_with_api(MockOptions(vms=5, hosts=1), scenario))
+
+
+def test_transient_failures_are_retried() -> None:
+    """A GET failing with 503 is sent again until it succeeds."""
+
+    async def scenario(api: XenOrchestraAPI, server: MockXoServer) -> None:
+        assert len(await api.getVMs()) == 5
+        assert server.stats.errors == 2
+        assert api.getDiagnostics()["retries"] == 2
+        assert api.getDiagnostics()["circuit_breaker"]["state"] == "closed"
+
+    asyncio.run(_with_api(MockOptions(vms=5, hosts=1, failing_requests=2), scenario))
+
+
+def test_breaker_stops_requests_to_a_failing_server() -> None:
+    """Once the breaker opens, requests fail without reaching xo-server."""
+
+    async def scenario(api: XenOrchestraAPI, server: MockXoServer) -> None:
+        for _ in range(2):
+            with pytest.raises(XenOrchestraAPIError):
+                await api.getVMs()
+        assert server.stats.total_requests == api_module.CIRCUIT_FAILURE_THRESHOLD
+        assert api.getDiagnostics()["circuit_breaker"]["state"] == "open"
+
+        with pytest.raises(CircuitOpenError):
+            await api.getVMs()
+        assert server.stats.total_requests == api_module.CIRCUIT_FAILURE_THRESHOLD
+
+    asyncio.run(_with_api(MockOptions(vms=5, hosts=1, error_rate=1.0), scenario))
+
+
+def test_identical_gets_share_one_request() -> None:
+    """Concurrent identical GETs await the request already in flight."""
+
+    async def scenario(api: XenOrchestraAPI, server: MockXoServer) -> None:
+        first, second = await asyncio.gather(api.getVMs(), api.getVMs())
+        assert first is second
+        assert server.stats.requests["GET vms"] == 1
+        assert api.getDiagnostics()["coalesced_requests"] == 1
+        assert api.getDiagnostics()["in_flight_gets"] == 0
+
+    asyncio.run(_with_api(MockOptions(vms=5, hosts=1, latency=0.05), scenario))
+
+
+def test_deleted_object_is_none() -> None:
+    """Only a 404 reports an object as gone."""
+
+    async def scenario(api: XenOrchestraAPI, server: MockXoServer) -> None:
+        vm_id = next(iter(server.objects["vms"]))
+        assert (await api.getVM(vm_id)).uuid == vm_id
+        del server.objects["vms"][vm_id]
+        assert await api.getVM(vm_id) is None
+
+        server.options.error_rate = 1.0
+        with pytest.raises(XenOrchestraAPIError):
+            await api.getHost(next(iter(server.objects["hosts"])))
+
+    asyncio.run(_with_api(MockOptions(vms=5, hosts=1), scenario))
+
+
+def test_action_returns_its_task_id() -> None:
+    """The task path of a 202 answer is turned into the task ID."""
+
+    async def scenario(api: XenOrchestraAPI, server: MockXoServer) -> None:
+        vm_id = next(iter(server.objects["vms"]))
+        task_id = await api.stopVM(vm_id)
+        assert task_id and "/" not in task_id
+        assert (await api.getTask(task_id))["status"] == "pending"
+        await asyncio.sleep(0.1)
+        assert (await api.getTask(task_id))["status"] == "success"
+        assert server.objects["vms"][vm_id]["power_state"] == "Halted"
+
+    asyncio.run(_with_api(MockOptions(vms=5, hosts=1, task_duration=0.05), scenario))
+
+
+@pytest.mark.parametrize("setting", ["STREAM_DECODE_MIN_SIZE", "EXECUTOR_DECODE_MIN_SIZE"])
+def test_large_bodies_decode_the_same(monkeypatch: pytest.MonkeyPatch, setting: str) -> None:
+    """Streamed and executor-decoded listings give the same models."""
+
+    async def listing() -> list:
+        return await _with_api(
+            MockOptions(vms=20, hosts=2),
+            lambda api, server: api.getVMs(),
+        )
+
+    expected = sorted(asyncio.run(listing()), key=lambda vm: vm.uuid)
+    monkeypatch.setattr(api_module, setting, 0)
+    assert sorted(asyncio.run(listing()), key=lambda vm: vm.uuid) == expected
@@ -0,0 +1,146 @@
+"""Tests for the data update coordinator against the mock xo-server."""
+from __future__ import annotations
+
+import asyncio
+import tempfile
+from datetime import timedelta
+from typing import Any, Awaitable, Callable
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from harness import add_config_entry, create_hass, serve_mock  # noqa: E402
+from mock_xo_server import MockOptions, MockXoServer  # noqa: E402
+
+from custom_components.xen_orchestra.const import (  # noqa: E402
+    CONF_INVENTORY_INTERVAL,
+    CONF_POWER_INTERVAL,
+    CONF_STATS_INTERVAL,
+    DOMAIN,
+)
+
+TIER_OPTIONS = {
+    CONF_POWER_INTERVAL: 5,
+    CONF_STATS_INTERVAL: 10,
+    CONF_INVENTORY_INTERVAL: 60,
+}
+
+
+async def _with_integration(
+    scenario: Callable[[Any, MockXoServer], Awaitable[Any]],
+    options: MockOptions | None = None,
+) -> Any:
+    """Set the integration up against a mock server and run a scenario."""
+    async with serve_mock(options or MockOptions(vms=6, hosts=2)) as (server, url):
+        with tempfile.TemporaryDirectory() as config_dir:
+            hass = await create_hass(config_dir)
+            try:
+                entry = await add_config_entry(hass, url, TIER_OPTIONS)
+                coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
+                try:
+                    return await scenario(coordinator, server)
+                finally:
+                    await hass.config_entries.async_unload(entry.entry_id)
+            finally:
+                await hass.async_stop(force=True)
+
+
+def test_update_interval_is_the_shortest_tier() -> None:
+    """The coordinator wakes up for the most frequent tier."""
+
+    async def scenario(coordinator: Any, server: MockXoServer) -> None:
+        assert coordinator.update_interval == timedelta(seconds=5)
+
+    asyncio.run(_with_integration(scenario))
+
+
+def test_only_due_tiers_are_fetched() -> None:
+    """An update fetches the power states or stats only once they are due."""
+
+    async def scenario(coordinator: Any, server: MockXoServer) -> None:
+        server.stats.reset()
+        await coordinator.async_refresh()
+        assert server.stats.total_requests == 0
+
+        coordinator._power_due = 0.0
+        await coordinator.async_refresh()
+        assert server.stats.requests["GET vms"] == 1
+        assert server.stats.requests["GET hosts/{id}/stats"] == 0
+
+        server.stats.reset()
+        coordinator._stats_due = 0.0
+        await coordinator.async_refresh()
+        assert server.stats.requests["GET vms"] == 0
+        assert server.stats.requests["GET hosts/{id}/stats"] == 2
+
+    asyncio.run(_with_integration(scenario))
+
+
+def test_power_tier_picks_up_power_changes() -> None:
+    """A power tier update changes the VM without a full inventory."""
+
+    async def scenario(coordinator: Any, server: MockXoServer) -> None:
+        vm_id, vm = next(iter(server.objects["vms"].items()))
+        vm["power_state"] = "Paused"
+        coordinator._power_due = 0.0
+        await coordinator.async_refresh()
+        assert coordinator.get_vm(vm_id).power_state == "Paused"
+
+    asyncio.run(_with_integration(scenario))
+
+
+
+def test_targeted_refresh_merges_into_current_data() -> None:
+    """A targeted refresh replaces only its objects and drops deleted ones."""
+
+    async def scenario(coordinator: Any, server: MockXoServer) -> None:
+        changed, deleted, *others = list(server.objects["vms"])
+        server.objects["vms"][changed]["name_label"] = "renamed"
+        del server.objects["vms"][deleted]
+        kept = {uuid: coordinator.get_vm(uuid) for uuid in others}
+
+        await coordinator.async_refresh_objects(vms=[changed, deleted])
+
+        assert coordinator.get_vm(changed).name_label == "renamed"
+        assert coordinator.get_vm(deleted) is None
+        assert deleted in coordinator._missing_objects
+        assert all(coordinator.get_vm(uuid) is vm for uuid, vm in kept.items())
+
+    asyncio.run(_with_integration(scenario))
+
+
+def test_unknown_task_stops_being_followed() -> None:
+    """A task answered with a 404 ends at once and still refreshes its VM."""
+
+    async def scenario(coordinator: Any, server: MockXoServer) -> None:
+        vm_id = next(iter(server.objects["vms"]))
+        done = asyncio.get_running_loop().create_future()
+        coordinator.tasks.async_track("unknown-task", vm_id, "start", done.set_result)
+        assert await asyncio.wait_for(done, 5) is None
+        assert server.stats.requests["GET tasks/{id}"] == 1
+        assert server.stats.requests["GET vms/{id}"] == 1
+        assert coordinator.tasks.pending == 0
+
+    asyncio.run(_with_integration(scenario))
+
+
+def test_stats_sweep_only_updates_stats_entities() -> None:
+    """New VM stats mark the stats of the VM changed, not the VM itself."""
+
+    async def scenario(coordinator: Any, server: MockXoServer) -> None:
+        vm_id = next(
+            uuid
+            for uuid, vm in server.objects["vms"].items()
+            if vm["power_state"] == "Running"
+        )
+        unsubscribe = coordinator.async_subscribe_vm_stats(vm_id)
+        for _ in range(2):
+            coordinator._stats_due = 0.0
+            await coordinator.async_refresh()
+        assert coordinator.get_vm_stats(vm_id)
+        assert not coordinator.async_object_changed(vm_id)
+        assert coordinator.async_object_changed(vm_id, stats=True)
+        unsubscribe()
+
+    asyncio.run(_with_integration(scenario))
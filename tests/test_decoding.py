@@ -0,0 +1,62 @@
+"""Tests for the streaming JSON array parser."""
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from custom_components.xen_orchestra.decoding import JsonArrayParser
+
+ITEMS = [
+    {"uuid": "a", "name_label": 'quote " and ] bracket'},
+    {"uuid": "b", "name_label": "back\\slash", "tags": ["x,y", "{z}"]},
+    "/rest/v0/vms/c",
+    {"nested": {"list": [1, [2, 3]], "empty": {}}},
+    42,
+    "escaped \\\" quote",
+]
+
+
+def _parse(document: bytes, size: int) -> tuple[list, JsonArrayParser]:
+    """Feed a document in chunks of the given size."""
+    parser = JsonArrayParser()
+    items = []
+    for start in range(0, len(document), size):
+        items += parser.feed(document[start:start + size])
+    return items, parser
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 64, 4096])
+def test_split_strings_and_escapes(size: int) -> None:
+    """Elements are decoded whatever the chunk boundaries."""
+    document = json.dumps(ITEMS, indent=1).encode()
+    items, parser = _parse(document, size)
+    assert items == ITEMS
+    assert parser.isArray
+    assert parser.close() is None
+
+
+@pytest.mark.parametrize("document", [b"[]", b"  [ ]  ", b"[\n]"])
+def test_empty_array(document: bytes) -> None:
+    """An empty array yields no elements."""
+    items, parser = _parse(document, 1)
+    assert items == []
+    assert parser.isArray
+    assert parser.close() is None
+
+
+@pytest.mark.parametrize("body", [{"id": "t", "status": "pending"}, "text", 3])
+def test_non_array_document(body) -> None:
+    """Documents that are not arrays are returned whole by close()."""
+    items, parser = _parse(b" " + json.dumps(body).encode(), 2)
+    assert items == []
+    assert not parser.isArray
+    assert parser.close() == body
+
+
+def test_truncated_array() -> None:
+    """An array cut short is reported instead of returning partial data."""
+    items, parser = _parse(b'[{"uuid": "a"}, {"uuid": "b"', 4)
+    assert items == [{"uuid": "a"}]
+    with pytest.raises(ValueError):
+        parser.close()
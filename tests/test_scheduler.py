@@ -0,0 +1,158 @@
+"""Tests for the request scheduler and circuit breaker."""
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from custom_components.xen_orchestra import scheduler
+from custom_components.xen_orchestra.scheduler import (
+    PRIORITY_BACKGROUND,
+    PRIORITY_INTERACTIVE,
+    AdaptiveRequestScheduler,
+    CircuitBreaker,
+    CircuitOpenError,
+    XenOrchestraAPIError,
+)
+
+
+async def _run_requests(
+    request_scheduler: AdaptiveRequestScheduler, priorities: list[tuple[str, int]]
+) -> list[str]:
+    """Queue requests behind a blocker and return the order they started in."""
+    started: list[str] = []
+    release = asyncio.Event()
+
+    async def request(name: str) -> None:
+        started.append(name)
+        await release.wait()
+
+    tasks = [
+        asyncio.create_task(request_scheduler.run(lambda n=name: request(n), priority))
+        for name, priority in priorities
+    ]
+    await asyncio.sleep(0)
+    release.set()
+    await asyncio.gather(*tasks)
+    return started
+
+
+def test_interactive_requests_jump_the_queue() -> None:
+    """Waiting interactive requests start before waiting background ones."""
+    request_scheduler = AdaptiveRequestScheduler(initial_limit=1, max_limit=1, reserved=0)
+    started = asyncio.run(
+        _run_requests(
+            request_scheduler,
+            [
+                ("bg0", PRIORITY_BACKGROUND),
+                ("bg1", PRIORITY_BACKGROUND),
+                ("bg2", PRIORITY_BACKGROUND),
+                ("ui", PRIORITY_INTERACTIVE),
+            ],
+        )
+    )
+    assert started == ["bg0", "ui", "bg1", "bg2"]
+
+
+def test_reserved_slots_are_added_to_the_limit() -> None:
+    """Interactive requests run at once even when background fills the limit."""
+
+    async def scenario() -> tuple[int, int]:
+        request_scheduler = AdaptiveRequestScheduler(initial_limit=1, max_limit=1, reserved=2)
+        release = asyncio.Event()
+        background = [
+            asyncio.create_task(request_scheduler.run(release.wait)) for _ in range(3)
+        ]
+        await asyncio.sleep(0)
+        background_in_flight = request_scheduler.inFlight
+        interactive = asyncio.create_task(
+            request_scheduler.run(release.wait, PRIORITY_INTERACTIVE)
+        )
+        await asyncio.sleep(0)
+        in_flight = request_scheduler.inFlight
+        release.set()
+        await asyncio.gather(*background, interactive)
+        return background_in_flight, in_flight
+
+    background_in_flight, in_flight = asyncio.run(scenario())
+    assert background_in_flight == 1
+    assert in_flight == 2
+
+
+def test_overload_halves_the_limit() -> None:
+    """A 503 answer cuts the concurrency limit."""
+    request_scheduler = AdaptiveRequestScheduler(initial_limit=8, max_limit=16)
+
+    async def overloaded() -> None:
+        raise XenOrchestraAPIError("busy", status=503)
+
+    with pytest.raises(XenOrchestraAPIError):
+        asyncio.run(request_scheduler.run(overloaded))
+    assert request_scheduler.limit == 4
+
+
+class _Clock:
+    """A monotonic clock advanced by hand."""
+
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> _Clock:
+    """Replace the clock the breaker reads."""
+    fake = _Clock()
+    monkeypatch.setattr(scheduler.time, "monotonic", fake)
+    return fake
+
+
+def test_breaker_opens_after_consecutive_failures(clock: _Clock) -> None:
+    """Requests are rejected once the failure threshold is reached."""
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=30)
+    for _ in range(2):
+        breaker.check()
+        breaker.recordFailure()
+    assert breaker.state == "closed"
+
+    breaker.check()
+    breaker.recordFailure()
+    assert breaker.state == "open"
+    with pytest.raises(CircuitOpenError):
+        breaker.check()
+
+
+def test_breaker_success_resets_the_count(clock: _Clock) -> None:
+    """Failures only open the circuit when they are consecutive."""
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30)
+    breaker.recordFailure()
+    breaker.recordSuccess()
+    breaker.recordFailure()
+    assert breaker.state == "closed"
+
+
+def test_breaker_probe_closes_or_reopens(clock: _Clock) -> None:
+    """After the reset timeout one probe decides whether to resume."""
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30)
+    breaker.recordFailure()
+    assert breaker.state == "open"
+
+    clock.now += 30
+    breaker.check()
+    assert breaker.state == "half_open"
+    # Only the probe gets through
+    with pytest.raises(CircuitOpenError):
+        breaker.check()
+
+    breaker.recordFailure()
+    assert breaker.state == "open"
+    with pytest.raises(CircuitOpenError):
+        breaker.check()
+
+    clock.now += 30
+    breaker.check()
+    breaker.recordSuccess()
+    assert breaker.state == "closed"
+    breaker.check()